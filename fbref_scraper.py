@@ -9,8 +9,8 @@ The underlying HTML on FBref pages often nests statistical tables inside HTML
 comments to deter simple scraping methods.  In addition, FBref deploys
 anti‑scraping measures such as Cloudflare that can return HTTP 403 errors
 when a request does not appear to come from a real browser.  To overcome
-these obstacles, this scraper uses the `beautifulsoup4` library to parse
-tables hidden in comments and can optionally rely on the `cloudscraper`
+these obstacles, this scraper uses `lxml` (falling back to the
+`beautifulsoup4` library) to parse tables hidden in comments and can optionally rely on the `cloudscraper`
 package to mimic a standard browser request.  These steps follow the
 approach described by Siddhraj Thakor, who notes that FBref tables are
 hidden within HTML comments and that Cloudflare protection can block
@@ -42,18 +42,33 @@ Command‑line usage
 
 ```
 python fbref_scraper.py --url <FBREF_STATS_URL> [--table <TABLE_ID>] [--output <DIRECTORY>]
+python fbref_scraper.py --urls-file <FILE> [--table <TABLE_ID>] [--output <DIRECTORY>] [--concurrency <N>]
 ```
 
 If ``--table`` is omitted, the scraper will download all available tables on
 the page.  If ``--output`` is provided, each extracted table will be
-written to a CSV file in the specified directory.
+written to a CSV file in the specified directory.  If ``--cache-dir`` is
+provided, parsed tables are stored there as Parquet files and reused on later
+runs for as long as FBref reports the page as unchanged (HTTP 304).  With
+``--urls-file``
+(one URL per line), the pages are downloaded concurrently using ``aiohttp``
+and the tables of each page are written to a sub‑directory named after the
+last segment of its URL.  Requests to one host are always spaced by
+``--min-interval`` seconds, which bounds batch throughput on FBref whatever
+``--concurrency`` is set to.
 
 Dependencies
 ------------
 
 * pandas
 * beautifulsoup4
+* lxml (optional, strongly recommended: much faster HTML parsing)
 * requests (standard library requests) or cloudscraper (optional)
+* aiohttp (optional, required for ``--urls-file`` batch mode)
+* brotli (optional, enables Brotli‑compressed responses)
+* pyarrow (optional, required for the ``--cache-dir`` Parquet cache)
+* requests-cache (optional, required for the ``--http-cache-hours`` HTTP cache)
+* zstandard (optional, required for ``--compress``)
 
 To install the optional dependency ``cloudscraper`` for handling
 Cloudflare's anti‑bot protections, run::
@@ -66,13 +81,26 @@ Cloudflare's anti‑bot protections, run::
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import io
+import json
 import os
+import random
 import re
 import sys
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup, Comment
 
 try:
@@ -80,13 +108,89 @@ try:
 except ImportError:
     cloudscraper = None  # type: ignore
 
+try:
+    import aiohttp  # type: ignore
+except ImportError:
+    aiohttp = None  # type: ignore
+
+try:
+    import lxml.html  # type: ignore
+except ImportError:
+    lxml = None  # type: ignore
+
+try:
+    import requests_cache  # type: ignore
+except ImportError:
+    requests_cache = None  # type: ignore
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None  # type: ignore
+
+# Only advertise Brotli when a decoder is installed; requests and aiohttp
+# cannot decompress "br" responses otherwise.
+_ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+# pandas.read_html flavor; ``None`` lets pandas pick its own default.
+_READ_HTML_FLAVOR = "lxml" if lxml is not None else None
+
+# Matches the IDs of the ``all_`` divs wrapping FBref tables.
+_ALL_RE = re.compile(r"^all_")
+
+# Matches a complete ``<table>`` element carrying an ``id`` attribute.  FBref
+# tables never nest, so the lazy match ends at the table's own closing tag.
+_TABLE_RE = re.compile(r'<table\b[^>]*\sid="([^"]+)"[\s\S]*?</table>')
+
+# Minimum number of tables on a page before parsing is spread over a process pool.
+_POOL_MIN_TABLES = 4
+
+# Shared HTTP sessions keyed by (uses cloudscraper, HTTP cache expiry).
+_SESSIONS: Dict[Tuple[bool, Optional[timedelta]], requests.Session] = {}
+_SESSION_LOCK = threading.Lock()
 
-def _create_session(use_cloudscraper: bool = True) -> requests.Session:
-    """Create an HTTP session.
+# FBref allows roughly 20 requests per minute; stay at or below that per host.
+_DEFAULT_MIN_INTERVAL = 3.0
+# Rate limiting / overload statuses retried by _fetch_response with backoff.
+_RETRY_STATUSES = frozenset({429, 503})
+_MAX_RETRIES = 5
+
+# SQLite database (".sqlite" is appended) used by the optional HTTP cache.
+_HTTP_CACHE_NAME = ".fbref_http_cache"
+
+if requests_cache is not None and cloudscraper is not None:
+
+    class _CachedCloudScraper(requests_cache.CacheMixin, cloudscraper.CloudScraper):  # type: ignore[misc]
+        """Cloudflare‑aware scraper whose responses are cached by ``requests-cache``."""
+
+else:
+    _CachedCloudScraper = None  # type: ignore
+
+# Browser-like headers for the aiohttp batch path, which cannot rely on
+# cloudscraper to fill them in.
+_ASYNC_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+}
+
+
+def _create_session(
+    use_cloudscraper: bool = True,
+    cache_expire_after: Optional[timedelta] = None,
+) -> requests.Session:
+    """Return the shared HTTP session, creating it on first use.
 
     If ``use_cloudscraper`` is True and the optional ``cloudscraper`` package
     is available, a Cloudflare‑aware scraper is returned.  Otherwise, a
-    vanilla ``requests.Session`` is created.
+    vanilla ``requests.Session`` is created.  Sessions are cached at module
+    level so that repeated calls reuse pooled connections and cookies
+    (including Cloudflare clearance cookies) instead of repeating the
+    TLS and challenge handshakes; call :func:`close_session` to discard them.
 
     Parameters
     ----------
@@ -94,18 +198,121 @@ def _create_session(use_cloudscraper: bool = True) -> requests.Session:
         Whether to use ``cloudscraper`` when available.  If the
         ``cloudscraper`` module is not installed, a normal session is used
         regardless of this flag.
+    cache_expire_after : Optional[datetime.timedelta]
+        When given, successful responses are cached in a local SQLite
+        database by the optional ``requests-cache`` package and served from
+        there until they are older than this.
 
     Returns
     -------
     requests.Session
         An HTTP session object suitable for performing GET requests.
+
+    Raises
+    ------
+    ImportError
+        If ``cache_expire_after`` is given but ``requests-cache`` is not installed.
+    """
+    use_cloud = use_cloudscraper and cloudscraper is not None
+    key = (use_cloud, cache_expire_after)
+    session = _SESSIONS.get(key)
+    if session is not None:
+        return session
+    if cache_expire_after is not None and requests_cache is None:
+        raise ImportError("requests-cache is required for HTTP caching; install it with 'pip install requests-cache'.")
+    cache_options = {
+        "cache_name": _HTTP_CACHE_NAME,
+        "backend": "sqlite",
+        "expire_after": cache_expire_after,
+        "allowable_codes": (200,),
+    }
+    with _SESSION_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            if use_cloud:
+                # Create a Cloudflare‑aware scraper.  This mimics a regular browser
+                # request and can reduce the likelihood of encountering a 403 error【882069327944702†L59-L63】.
+                if cache_expire_after is not None:
+                    session = _CachedCloudScraper(**cache_options)
+                else:
+                    session = cloudscraper.create_scraper()
+            else:
+                # Fallback to a standard requests Session with a larger connection pool.
+                if cache_expire_after is not None:
+                    session = requests_cache.CachedSession(**cache_options)
+                else:
+                    session = requests.Session()
+                # Connection errors and 5xx gateway errors are retried by urllib3;
+                # 429/503 are handled by _fetch_response, which honours Retry-After.
+                retry = Retry(
+                    total=_MAX_RETRIES,
+                    backoff_factor=1,
+                    status_forcelist=[500, 502, 504],
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+            session.headers.update({"Accept-Encoding": _ACCEPT_ENCODING})
+            _SESSIONS[key] = session
+    return session
+
+
+def close_session() -> None:
+    """Close and discard the shared HTTP sessions created by :func:`_create_session`."""
+    with _SESSION_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+class _DomainLimiter:
+    """Space out requests to the same host by at least ``min_interval`` seconds.
+
+    Each call reserves the next free time slot for the URL's host under a
+    lock and then waits until that slot, so the limiter can be shared by the
+    blocking ``requests`` path and the ``asyncio`` path.
     """
-    if use_cloudscraper and cloudscraper is not None:
-        # Create a Cloudflare‑aware scraper.  This mimics a regular browser
-        # request and can reduce the likelihood of encountering a 403 error【882069327944702†L59-L63】.
-        return cloudscraper.create_scraper()  # type: ignore[no-any-return]
-    # Fallback to a standard requests Session.
-    return requests.Session()
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, url: str) -> float:
+        """Reserve a request slot for ``url``'s host and return the delay until it."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        return slot - now
+
+    def wait(self, url: str) -> None:
+        """Block until a request to ``url`` is allowed."""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str) -> None:
+        """Asynchronously wait until a request to ``url`` is allowed."""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_LIMITER = _DomainLimiter(_DEFAULT_MIN_INTERVAL)
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Return how long to wait before retry number ``attempt`` (0‑based).
+
+    A numeric ``Retry-After`` header is honoured; otherwise the delay grows
+    exponentially with random jitter.
+    """
+    if retry_after and retry_after.strip().isdigit():
+        return float(retry_after)
+    return 2**attempt + random.uniform(0, 1)
 
 
 def _fetch_page(session: requests.Session, url: str) -> str:
@@ -128,9 +335,91 @@ def _fetch_page(session: requests.Session, url: str) -> str:
     requests.HTTPError
         If the request returns a non‑200 HTTP status code.
     """
-    response = session.get(url)
+    return _decode_body(_fetch_response(session, url).content)
+
+
+def _decode_body(body: bytes) -> str:
+    """Decode a response body.
+
+    FBref always serves UTF‑8, so the body is decoded directly instead of
+    letting ``requests`` guess the encoding by scanning the whole page.
+    """
+    return body.decode("utf-8", errors="replace")
+
+
+def _fetch_response(
+    session: requests.Session,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    """Send a GET request and return the raw response.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to send the GET request.
+    url : str
+        URL of the page to download.
+    headers : Optional[Dict[str, str]], optional
+        Extra request headers, such as the ``If-None-Match`` validators of
+        a conditional request.
+
+    Returns
+    -------
+    requests.Response
+        The response.  A ``304 Not Modified`` response is returned as is.
+
+    Requests are paced per host by the module rate limiter, and ``429``/
+    ``503`` responses are retried with exponential backoff.
+
+    Raises
+    ------
+    requests.HTTPError
+        If the request returns an HTTP error status code.
+    """
+    for attempt in range(_MAX_RETRIES + 1):
+        _LIMITER.wait(url)
+        response = session.get(url, headers=headers)
+        if response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+            break
+        time.sleep(_retry_delay(response.headers.get("Retry-After"), attempt))
     response.raise_for_status()
-    return response.text
+    return response
+
+
+async def _fetch_page_async(session: "aiohttp.ClientSession", url: str) -> str:
+    """Asynchronously retrieve the HTML content of a web page.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Shared client session used to send the GET request.
+    url : str
+        URL of the page to download.
+
+    Returns
+    -------
+    str
+        The response text (HTML) of the page.
+
+    Requests are paced and retried in the same way as in
+    :func:`_fetch_response`.
+
+    Raises
+    ------
+    aiohttp.ClientResponseError
+        If the request returns a non‑200 HTTP status code.
+    """
+    attempt = 0
+    while True:
+        await _LIMITER.wait_async(url)
+        async with session.get(url, headers=_ASYNC_HEADERS) as response:
+            if response.status not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                response.raise_for_status()
+                return _decode_body(await response.read())
+            delay = _retry_delay(response.headers.get("Retry-After"), attempt)
+        await asyncio.sleep(delay)
+        attempt += 1
 
 
 def _flatten_headers(df: pd.DataFrame) -> pd.DataFrame:
@@ -139,8 +428,9 @@ def _flatten_headers(df: pd.DataFrame) -> pd.DataFrame:
     FBref tables often have multi‑level column headers representing
     hierarchical information (e.g., a first level of group names and a
     second level of statistic names).  To simplify further analysis, this
-    helper joins the tuples into single strings with spaces.  If a column
-    header is already a string, it is left unchanged.
+    helper joins the tuples into single strings with spaces, dropping the
+    ``Unnamed: N_level_M`` placeholders pandas generates for empty group
+    cells.  Single‑level headers are only stripped of whitespace.
 
     Parameters
     ----------
@@ -152,29 +442,76 @@ def _flatten_headers(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         The input DataFrame with flattened column names.
     """
-    new_columns = []
-    for col in df.columns:
-        if isinstance(col, tuple):
-            # Join tuple components and strip whitespace
-            new_columns.append(" ".join([str(c).strip() for c in col if c]))
-        else:
-            new_columns.append(str(col).strip())
-    df.columns = new_columns
+    if isinstance(df.columns, pd.MultiIndex):
+        # Join tuple components, skipping empty and "Unnamed" levels
+        df.columns = df.columns.map(
+            lambda col: " ".join(
+                part.strip() for part in map(str, col) if part and not part.startswith("Unnamed")
+            )
+        )
+    else:
+        df.columns = df.columns.astype(str).str.strip()
     return df
 
 
-def _extract_table_from_div(div: BeautifulSoup, table_id: Optional[str] = None) -> Optional[pd.DataFrame]:
-    """Parse a single FBref table hidden inside an HTML comment.
+def _slice_table(html: str, table_id: Optional[str] = None, start: int = 0) -> Optional[str]:
+    """Return the raw HTML of a ``<table>`` found in ``html`` by regex.
+
+    Parameters
+    ----------
+    html : str
+        HTML text to search, typically the contents of an FBref comment.
+    table_id : Optional[str], optional
+        ID of the table to return.  When ``None``, the first table with an
+        ID is returned.
+    start : int, optional
+        Position in ``html`` at which to start searching.
+
+    Returns
+    -------
+    Optional[str]
+        The matching ``<table>...</table>`` substring, or ``None`` if no
+        table matched.
+    """
+    for match in _TABLE_RE.finditer(html, start):
+        if table_id is None or match.group(1) == table_id:
+            return match.group(0)
+    return None
+
+
+def _comment_text(div: BeautifulSoup) -> Optional[str]:
+    """Return the text of the HTML comment holding a FBref table.
 
     FBref wraps many of its tables in an HTML comment inside a ``div`` with
-    an ID like ``all_stats_standard``.  This function extracts the comment,
-    parses it, and reads the embedded ``<table>`` into a pandas
-    ``DataFrame``.  The resulting DataFrame has flattened column headers.
+    an ID like ``all_stats_standard``.  The comment is normally a direct
+    child of the div; the whole subtree is only searched if it is not.
 
     Parameters
     ----------
     div : BeautifulSoup
         The ``div`` element whose comment contains the table.
+
+    Returns
+    -------
+    Optional[str]
+        The comment's text, or ``None`` if the div holds no comment.
+    """
+    comment = next((child for child in div.contents if isinstance(child, Comment)), None)
+    if comment is None:
+        comment = div.find(string=lambda text: isinstance(text, Comment))
+    return str(comment) if comment else None
+
+
+def _extract_table_from_comment(comment_text: str, table_id: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Parse a single FBref table hidden inside an HTML comment.
+
+    The embedded ``<table>`` is read into a pandas ``DataFrame`` with
+    flattened column headers.
+
+    Parameters
+    ----------
+    comment_text : str
+        Text of the comment containing the table.
     table_id : Optional[str], optional
         ID of the table to extract.  If provided, the function only
         returns data for a table whose ``<table>`` element has a matching
@@ -186,29 +523,179 @@ def _extract_table_from_div(div: BeautifulSoup, table_id: Optional[str] = None)
         A DataFrame containing the parsed table, or ``None`` if no
         matching table is found.
     """
-    # The table is stored within an HTML comment.
-    comment = div.find(string=lambda text: isinstance(text, Comment))
-    if not comment:
-        return None
-    # Parse the comment's HTML
-    soup = BeautifulSoup(comment, "html.parser")
-    # If a specific table ID is requested, locate it; otherwise, pick the first table.
-    table_tag = soup.find("table", id=table_id) if table_id else soup.find("table")
-    if table_tag is None:
-        return None
+    # Slice the table straight out of the comment text.  If the regex cannot
+    # find it, hand the whole comment to read_html and let it match the ID.
+    table_html = _slice_table(comment_text, table_id) or comment_text
+    return _read_table(table_html, table_id)
+
+
+def _read_table(table_html: str, table_id: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Read a table's HTML into a DataFrame with flattened column headers.
+
+    Parameters
+    ----------
+    table_html : str
+        HTML containing the table.
+    table_id : Optional[str], optional
+        ID of the table to read.  When ``None``, the first table is read.
+
+    Returns
+    -------
+    Optional[pandas.DataFrame]
+        The parsed table, or ``None`` if no matching table could be read.
+    """
+    attrs = {"id": table_id} if table_id else None
     # Use pandas to read the table into a DataFrame.  read_html returns a list.
     try:
-        df = pd.read_html(str(table_tag))[0]
+        df = pd.read_html(io.StringIO(table_html), flavor=_READ_HTML_FLAVOR, attrs=attrs)[0]
     except ValueError:
-        # read_html failed – return None to signal an empty table.
+        # read_html failed (or found no matching table) – return None to signal an empty table.
         return None
     return _flatten_headers(df)
 
 
+def _extract_single_table(html: str, table_id: str) -> Optional[pd.DataFrame]:
+    """Extract one table from a full page without building a parse tree.
+
+    The ``all_<table_id>`` wrapper ``div`` is located with a regex and the
+    first matching ``<table>`` after it – which FBref keeps inside the
+    div's comment – is sliced out of the raw page.
+
+    Parameters
+    ----------
+    html : str
+        HTML content of an FBref stats page.
+    table_id : str
+        ID of the table to extract.
+
+    Returns
+    -------
+    Optional[pandas.DataFrame]
+        The parsed table, or ``None`` if it could not be found this way.
+    """
+    div_match = re.search(rf'<div\b[^>]*\sid="all_{re.escape(table_id)}"', html)
+    if div_match is None:
+        return None
+    table_html = _slice_table(html, table_id, start=div_match.end())
+    if table_html is None:
+        return None
+    return _read_table(table_html, table_id)
+
+
+def _cache_dir_for(cache_dir: str, url: str) -> Path:
+    """Return the cache sub‑directory holding the tables of ``url``."""
+    return Path(cache_dir) / hashlib.blake2b(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_path(cache_dir: str, url: str, table_id: str) -> Path:
+    """Return the Parquet file caching table ``table_id`` of ``url``."""
+    return _cache_dir_for(cache_dir, url) / f"{table_id}.parquet"
+
+
+def _load_cache_meta(cache_dir: str, url: str) -> Optional[dict]:
+    """Load the cache metadata (validators and table IDs) stored for ``url``."""
+    try:
+        with open(_cache_dir_for(cache_dir, url) / "meta.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _same_page_version(meta: dict, etag: Optional[str], last_modified: Optional[str]) -> bool:
+    """Return whether the validators in ``meta`` identify the same page version.
+
+    The ``ETag`` is compared when the server sends one; otherwise the
+    ``Last-Modified`` date is.  Without either, the versions cannot be
+    matched and ``False`` is returned.
+    """
+    if etag:
+        return meta.get("etag") == etag
+    if last_modified:
+        return meta.get("last_modified") == last_modified
+    return False
+
+
+def _fetch_tables_cached(
+    session: requests.Session,
+    url: str,
+    table_id: Optional[str],
+    cache_dir: str,
+) -> Dict[str, pd.DataFrame]:
+    """Fetch tables through the on‑disk Parquet cache.
+
+    If tables for ``url`` were cached by a previous call, a conditional GET
+    is sent using the stored ``ETag``/``Last-Modified`` validators.  When the
+    server answers ``304 Not Modified`` the cached Parquet files are loaded
+    and neither the page body nor the tables are downloaded or parsed.
+    Otherwise the page is parsed as usual and the cache is refreshed.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to send the GET request.
+    url : str
+        Full URL to the FBref stats page.
+    table_id : Optional[str]
+        ID of a specific table to extract, or ``None`` for all tables.
+    cache_dir : str
+        Directory in which the cache is stored.
+
+    Returns
+    -------
+    Dict[str, pandas.DataFrame]
+        A mapping from table identifiers to DataFrames.
+    """
+    meta = _load_cache_meta(cache_dir, url)
+    headers: Dict[str, str] = {}
+    # The cache can only answer the request if it holds the requested table,
+    # or every table on the page when no specific table was requested.
+    if meta is not None and (meta.get("complete") or (table_id is not None and table_id in meta["tables"])):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = _fetch_response(session, url, headers=headers)
+    if headers and response.status_code == 304:
+        names = meta["tables"] if table_id is None else [table_id]
+        return {
+            name: pd.read_parquet(_cache_path(cache_dir, url, name))
+            for name in names
+            if name in meta["tables"]
+        }
+
+    tables = _parse_tables(_decode_body(response.content), table_id=table_id)
+    page_dir = _cache_dir_for(cache_dir, url)
+    page_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in tables.items():
+        df.to_parquet(_cache_path(cache_dir, url, name), compression="zstd", index=False)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    known_tables = set(tables)
+    complete = table_id is None
+    # A single-table fetch of an unchanged page keeps the tables cached
+    # earlier, including a complete all-tables entry.
+    if table_id is not None and meta is not None and _same_page_version(meta, etag, last_modified):
+        known_tables.update(meta.get("tables", []))
+        complete = bool(meta.get("complete"))
+    meta = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "tables": sorted(known_tables),
+        "complete": complete,
+    }
+    with open(page_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return tables
+
+
 def fetch_fbref_tables(
     url: str,
     table_id: Optional[str] = None,
     use_cloudscraper: bool = True,
+    cache_dir: Optional[str] = None,
+    cache_expire_after: Optional[timedelta] = None,
 ) -> Dict[str, pd.DataFrame]:
     """Download and parse statistical tables from a FBref stats page.
 
@@ -234,6 +721,15 @@ def fetch_fbref_tables(
         installed, the scraper will attempt to mimic a browser to reduce
         the chance of HTTP 403 responses.  Set this to ``False`` to use a
         plain ``requests`` session.
+    cache_dir : Optional[str], default ``None``
+        Directory for a Parquet cache of the parsed tables, keyed by URL
+        and table ID.  Cached tables are reused while the server reports
+        the page as unchanged.  Requires ``pyarrow``.  When ``None``,
+        nothing is cached.
+    cache_expire_after : Optional[datetime.timedelta], default ``None``
+        Cache raw HTTP responses in a local SQLite database for this long,
+        so that repeated runs do not download the same page again.
+        Requires ``requests-cache``.  When ``None``, responses are not cached.
 
     Returns
     -------
@@ -242,32 +738,176 @@ def fetch_fbref_tables(
         DataFrames containing the parsed data.  If no tables are found,
         an empty dictionary is returned.
     """
-    session = _create_session(use_cloudscraper=use_cloudscraper)
+    session = _create_session(use_cloudscraper=use_cloudscraper, cache_expire_after=cache_expire_after)
+    if cache_dir is not None:
+        return _fetch_tables_cached(session, url, table_id, cache_dir)
     html = _fetch_page(session, url)
-    soup = BeautifulSoup(html, "html.parser")
-    tables: Dict[str, pd.DataFrame] = {}
-    # Regular expression to match IDs that start with "all_"
-    pattern = re.compile(r"^all_")
-    # Iterate through all divs and extract tables
-    for div in soup.find_all("div", id=pattern):
-        div_id = div.get("id", "")
-        # Derive the table identifier by stripping the "all_" prefix
-        key = div_id[4:]
-        # If a specific table_id is requested and this one does not match, skip it
-        if table_id is not None and key != table_id:
+    return _parse_tables(html, table_id=table_id)
+
+
+async def fetch_fbref_tables_many(
+    urls: List[str],
+    table_id: Optional[str] = None,
+    max_concurrency: int = 8,
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """Download and parse several FBref stats pages concurrently.
+
+    Pages are fetched over a single ``aiohttp`` session with at most
+    ``max_concurrency`` requests in flight.  Parsing is CPU bound, so each
+    downloaded page is handed to a process pool to keep the event loop free
+    for the remaining downloads.  URLs that fail to download or parse are
+    reported on stderr and omitted from the result.
+
+    Every request still goes through the per‑host rate limiter, so pages on
+    the same host start at most one per ``min_interval`` seconds (3 s by
+    default, see ``--min-interval``).  All FBref pages share one host, so
+    with the default interval the downloads are effectively sequential and
+    ``max_concurrency`` only overlaps slow responses and parsing; lower the
+    interval to make it raise throughput.
+
+    Parameters
+    ----------
+    urls : List[str]
+        FBref stats page URLs to scrape.
+    table_id : Optional[str], default ``None``
+        ID of a specific table to extract from every page.  See
+        :func:`fetch_fbref_tables`.
+    max_concurrency : int, default ``8``
+        Maximum number of simultaneous HTTP requests.  Request starts are
+        still spaced by the per‑host rate limiter.
+
+    Returns
+    -------
+    Dict[str, Dict[str, pandas.DataFrame]]
+        A mapping from each successfully scraped URL to its tables, in the
+        same format as returned by :func:`fetch_fbref_tables`.
+
+    Raises
+    ------
+    ImportError
+        If the optional ``aiohttp`` package is not installed.
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp is required for concurrent fetching; install it with 'pip install aiohttp'.")
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit_per_host=max_concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        with ProcessPoolExecutor() as executor:
+
+            async def _fetch_one(page_url: str) -> Dict[str, pd.DataFrame]:
+                async with semaphore:
+                    html = await _fetch_page_async(session, page_url)
+                return await loop.run_in_executor(executor, _parse_tables, html, table_id, False)
+
+            results = await asyncio.gather(*(_fetch_one(u) for u in urls), return_exceptions=True)
+
+    tables_by_url: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for page_url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            sys.stderr.write(f"Error fetching tables from {page_url}: {result}\n")
             continue
-        df = _extract_table_from_div(div, table_id=key)
+        tables_by_url[page_url] = result
+    return tables_by_url
+
+
+def _parse_table_payload(payload: Tuple[str, str]) -> Tuple[str, Optional[pd.DataFrame]]:
+    """Parse one table from its comment text in a worker process.
+
+    Parameters
+    ----------
+    payload : Tuple[str, str]
+        The table identifier and the text of the comment holding the table.
+
+    Returns
+    -------
+    Tuple[str, Optional[pandas.DataFrame]]
+        The table identifier and the parsed DataFrame (``None`` if the
+        table could not be extracted).
+    """
+    key, comment_text = payload
+    return key, _extract_table_from_comment(comment_text, table_id=key)
+
+
+def _table_comments(html: str) -> List[Tuple[str, str]]:
+    """Collect ``(table_id, comment_text)`` pairs for every ``all_`` div on a page.
+
+    With lxml available the divs are found with an XPath query evaluated in
+    C; otherwise the page is parsed with BeautifulSoup's ``html.parser``.
+    """
+    comments: List[Tuple[str, str]] = []
+    if lxml is not None:
+        tree = lxml.html.fromstring(html)
+        for div in tree.xpath("//div[starts-with(@id, 'all_')]"):
+            found = div.xpath("comment()")
+            if found:
+                # Derive the table identifier by stripping the "all_" prefix
+                comments.append((div.get("id")[4:], found[0].text or ""))
+        return comments
+
+    soup = BeautifulSoup(html, "html.parser")
+    for div in soup.find_all("div", id=_ALL_RE):
+        comment_text = _comment_text(div)
+        if comment_text is not None:
+            comments.append((div.get("id", "")[4:], comment_text))
+    return comments
+
+
+def _parse_tables(html: str, table_id: Optional[str] = None, parallel: bool = True) -> Dict[str, pd.DataFrame]:
+    """Extract the statistical tables from a downloaded FBref page.
+
+    This is a module‑level function so that it can be dispatched to a
+    process pool by :func:`fetch_fbref_tables_many`.
+
+    Parameters
+    ----------
+    html : str
+        HTML content of an FBref stats page.
+    table_id : Optional[str], default ``None``
+        ID of a specific table to extract.  When ``None``, every table on
+        the page is returned.
+    parallel : bool, default ``True``
+        Parse the tables in a process pool when the page holds at least
+        ``_POOL_MIN_TABLES`` of them.  Pass ``False`` when already running
+        inside a worker process.
+
+    Returns
+    -------
+    Dict[str, pandas.DataFrame]
+        A mapping from table identifiers to DataFrames.
+    """
+    if table_id is not None:
+        # Fast path: slice the single requested table out of the raw HTML and
+        # only fall back to parsing the whole page if that fails.
+        df = _extract_single_table(html, table_id)
         if df is not None:
-            tables[key] = df
-    return tables
+            return {table_id: df}
+
+    payloads = [
+        (key, comment_text)
+        for key, comment_text in _table_comments(html)
+        # If a specific table_id is requested and this one does not match, skip it
+        if table_id is None or key == table_id
+    ]
+
+    if parallel and len(payloads) >= _POOL_MIN_TABLES:
+        # Table parsing is CPU bound; spread it over the available cores.
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_parse_table_payload, payloads, chunksize=4))
+    else:
+        # Too few tables to pay for starting worker processes.
+        results = [_parse_table_payload(payload) for payload in payloads]
+    return {key: df for key, df in results if df is not None}
 
 
-def save_tables_to_csv(tables: Dict[str, pd.DataFrame], output_dir: str) -> None:
+def save_tables_to_csv(tables: Dict[str, pd.DataFrame], output_dir: str, compress: bool = False) -> None:
     """Save DataFrames to CSV files in the specified directory.
 
     Each table in the ``tables`` dictionary will be written to
-    ``<output_dir>/<table_name>.csv``.  The output directory is created
-    if it does not already exist.
+    ``<output_dir>/<table_name>.csv`` (or ``.csv.zst`` when compressed).
+    The output directory is created if it does not already exist.  Tables
+    are written concurrently from a small thread pool.
 
     Parameters
     ----------
@@ -275,13 +915,34 @@ def save_tables_to_csv(tables: Dict[str, pd.DataFrame], output_dir: str) -> None
         Mapping from table names to DataFrames.
     output_dir : str
         Directory path in which CSV files will be saved.
+    compress : bool, default ``False``
+        Write Zstandard‑compressed CSV files.  Requires ``zstandard``.
     """
+    if not tables:
+        return
     os.makedirs(output_dir, exist_ok=True)
-    for name, df in tables.items():
+    suffix = ".csv.zst" if compress else ".csv"
+
+    def _write(item: Tuple[str, pd.DataFrame]) -> None:
+        name, df = item
         # Construct a safe file name
-        fname = f"{name}.csv"
-        path = os.path.join(output_dir, fname)
-        df.to_csv(path, index=False)
+        path = os.path.join(output_dir, f"{name}{suffix}")
+        df.to_csv(path, index=False, compression="zstd" if compress else None)
+
+    with ThreadPoolExecutor(max_workers=min(8, len(tables))) as executor:
+        # list() re-raises the first write error, if any.
+        list(executor.map(_write, tables.items()))
+
+
+def _url_slug(url: str) -> str:
+    """Return the last path segment of ``url`` for use as a directory name."""
+    return url.rstrip("/").rsplit("/", 1)[-1] or "page"
+
+
+def _read_urls_file(path: str) -> List[str]:
+    """Read one URL per line from ``path``, ignoring blanks and ``#`` comments."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -300,11 +961,16 @@ def main(argv: Optional[list[str]] = None) -> int:
         Exit status code (0 on success, non‑zero on failure).
     """
     parser = argparse.ArgumentParser(description="Download tables from an FBref stats page.")
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--url",
-        required=True,
         help="FBref stats page URL to scrape (e.g., https://fbref.com/en/comps/9/2024-2025/stats/2024-2025-Premier-League-Stats)",
     )
+    source.add_argument(
+        "--urls-file",
+        default=None,
+        help="Text file with one FBref stats page URL per line.  The pages are fetched concurrently.",
+    )
     parser.add_argument(
         "--table",
         default=None,
@@ -315,19 +981,77 @@ def main(argv: Optional[list[str]] = None) -> int:
     parser.add_argument(
         "--no-cloudscraper",
         action="store_true",
-        help="Do not use cloudscraper even if it is installed; fall back to plain requests.",
+        help="Do not use cloudscraper even if it is installed; fall back to plain requests (--url mode only).",
     )
     parser.add_argument(
         "--output",
         default=None,
         help=("Optional directory path to save extracted tables as CSV files.  If not provided, tables are printed to stdout."),
     )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write Zstandard-compressed CSV files (.csv.zst) to --output (requires zstandard).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Optional directory for caching parsed tables as Parquet files between runs (requires pyarrow; --url mode only).",
+    )
+    parser.add_argument(
+        "--http-cache-hours",
+        type=float,
+        default=None,
+        help="Cache raw HTTP responses locally for this many hours (requires requests-cache; --url mode only).",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=_DEFAULT_MIN_INTERVAL,
+        help=f"Minimum number of seconds between requests to the same host (default: {_DEFAULT_MIN_INTERVAL}).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help=(
+            "Maximum number of simultaneous requests in --urls-file mode (default: 8).  Requests to the same "
+            "host still start at most once per --min-interval seconds, so for FBref pages this only overlaps "
+            "slow responses unless the interval is lowered."
+        ),
+    )
     args = parser.parse_args(argv)
+    if args.urls_file:
+        # Batch mode downloads through aiohttp, which has neither the
+        # cloudscraper session nor the Parquet/HTTP caches.
+        unsupported = [
+            flag
+            for flag, value in (
+                ("--cache-dir", args.cache_dir),
+                ("--http-cache-hours", args.http_cache_hours),
+                ("--no-cloudscraper", args.no_cloudscraper),
+            )
+            if value
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --urls-file")
+    if args.compress and not args.output:
+        parser.error("--compress requires --output")
+    _LIMITER.min_interval = args.min_interval
+
+    if args.urls_file:
+        return _run_batch(args)
 
     # Determine whether to use cloudscraper
     use_cloud = not args.no_cloudscraper
     try:
-        tables = fetch_fbref_tables(url=args.url, table_id=args.table, use_cloudscraper=use_cloud)
+        tables = fetch_fbref_tables(
+            url=args.url,
+            table_id=args.table,
+            use_cloudscraper=use_cloud,
+            cache_dir=args.cache_dir,
+            cache_expire_after=timedelta(hours=args.http_cache_hours) if args.http_cache_hours else None,
+        )
     except Exception as exc:
         sys.stderr.write(f"Error fetching tables: {exc}\n")
         return 1
@@ -335,7 +1059,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         sys.stderr.write("No tables were found or extracted.\n")
         return 1
     if args.output:
-        save_tables_to_csv(tables, args.output)
+        save_tables_to_csv(tables, args.output, compress=args.compress)
     else:
         for name, df in tables.items():
             print(f"\nTable: {name}")
@@ -343,5 +1067,35 @@ def main(argv: Optional[list[str]] = None) -> int:
     return 0
 
 
+def _run_batch(args: argparse.Namespace) -> int:
+    """Fetch every URL listed in ``args.urls_file`` concurrently and report the tables."""
+    try:
+        urls = _read_urls_file(args.urls_file)
+    except OSError as exc:
+        sys.stderr.write(f"Error reading URLs file: {exc}\n")
+        return 1
+    if not urls:
+        sys.stderr.write("No URLs found in the URLs file.\n")
+        return 1
+    try:
+        tables_by_url = asyncio.run(
+            fetch_fbref_tables_many(urls, table_id=args.table, max_concurrency=args.concurrency)
+        )
+    except Exception as exc:
+        sys.stderr.write(f"Error fetching tables: {exc}\n")
+        return 1
+    if not any(tables_by_url.values()):
+        sys.stderr.write("No tables were found or extracted.\n")
+        return 1
+    for url, tables in tables_by_url.items():
+        if args.output:
+            save_tables_to_csv(tables, os.path.join(args.output, _url_slug(url)), compress=args.compress)
+        else:
+            for name, df in tables.items():
+                print(f"\nTable: {name} ({url})")
+                print(df.head())
+    return 0
+
+
 if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
\ No newline at end of file
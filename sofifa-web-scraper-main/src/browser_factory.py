@@ -0,0 +1,97 @@
+"""
+Shared Playwright setup for the SoFIFA scrapers
+Stealth browser launch, context options and resource blocking in one place
+"""
+import random
+import re
+from types import MappingProxyType
+from playwright.async_api import Browser, BrowserContext, Playwright
+from playwright_stealth import Stealth
+
+# Chromium flags for comprehensive anti-detection (immutable, shared by every scraper)
+LAUNCH_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-infobars',
+    '--window-size=1920,1080',
+    '--start-maximized',
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-notifications'
+)
+
+# More realistic user agents (latest Chrome)
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+)
+
+EXTRA_HTTP_HEADERS = MappingProxyType({
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'sec-ch-ua': '"Chromium";v="131", "Not_A Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"'
+})
+
+# Image, stylesheet, font and media URLs; only these requests are routed to Python
+BLOCKED_URL_RE = re.compile(r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|css|woff2?|ttf|otf|eot|mp4|webm|mp3)(?:[?#]|$)", re.IGNORECASE)
+
+# Cloudflare challenge checks run in the page, so the full HTML never has to be
+# serialized; challenge-platform scripts can linger after a solve, so only the
+# interstitial text counts as "still blocked"
+CF_PENDING_JS = """() => document.title.includes('Just a moment')
+    || (document.body ? document.body.textContent : '').includes('Checking your browser')"""
+CF_CHALLENGE_JS = """() => !!document.querySelector('#challenge-platform, #cf-challenge-running, #cf-browser-verification, [src*="challenge-platform"]')
+    || document.title.includes('Just a moment')
+    || (document.body ? document.body.textContent : '').includes('Checking your browser')"""
+
+
+async def _abort(route):
+    """Route handler dropping a blocked request"""
+    await route.abort()
+
+
+def context_options() -> dict:
+    """Return browser context options with a randomly chosen user agent"""
+    return {
+        'user_agent': random.choice(USER_AGENTS),
+        'viewport': {'width': 1920, 'height': 1080},
+        'locale': 'en-US',
+        'timezone_id': 'America/New_York',
+        'permissions': ['geolocation'],
+        'geolocation': {'latitude': 40.7128, 'longitude': -74.0060},
+        'extra_http_headers': dict(EXTRA_HTTP_HEADERS)
+    }
+
+
+async def launch_stealth_browser(p: Playwright) -> Browser:
+    """Launch headless Chromium with the anti-detection flags"""
+    return await p.chromium.launch(headless=True, args=list(LAUNCH_ARGS))
+
+
+async def new_stealth_context(browser: Browser, **overrides) -> BrowserContext:
+    """
+    Create a browser context with stealth mode and asset blocking applied
+    Keyword arguments override the default context options (e.g. storage_state)
+    """
+    context = await browser.new_context(**{**context_options(), **overrides})
+
+    # Apply stealth mode to every page opened in the context
+    await Stealth().apply_stealth_async(context)
+
+    # Block images, stylesheets, fonts and media by URL so other requests never reach Python
+    await context.route(BLOCKED_URL_RE, _abort)
+    return context
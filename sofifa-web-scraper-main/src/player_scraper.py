@@ -2,9 +2,78 @@
 Modular SoFIFA Player Scraper
 Extracts comprehensive player data from sofifa.com
 """
+import json
 import re
 from playwright.async_api import Page
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Stat categories on the player page, in the order they are extracted
+STAT_SECTIONS = ('attacking', 'skill', 'movement', 'power', 'mentality', 'defending', 'goalkeeping')
+
+_PLAYER_ID_RE = re.compile(r'/player/(\d+)/')
+_VERSION_RE = re.compile(r'/(\d+)/?$')
+_NUMBER_RE = re.compile(r'\d+')
+_FLOAT_PREFIX_RE = re.compile(r'\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_TEAM_ID_RE = re.compile(r'/team/(\d+)/')
+_LEAGUE_ID_RE = re.compile(r'/league/(\d+)')
+
+
+def _text(node) -> str:
+    """Trimmed text content of a node, '' for a missing node"""
+    return node.text().strip() if node is not None else ''
+
+
+def _extract_number(text: str) -> str:
+    """Extract the first integer from text"""
+    match = _NUMBER_RE.search(text or '')
+    return match.group(0) if match else ''
+
+
+def _parse_value(text: str) -> str:
+    """Parse value/wage (e.g., "€22M" -> "22000000") the same way as the in-page script"""
+    if not text:
+        return ''
+    text = re.sub(r'[€$£,]', '', text)
+    if 'M' in text or 'K' in text:
+        match = _FLOAT_PREFIX_RE.match(text)
+        if not match:
+            return 'NaN'
+        number = float(match.group(0)) * (1000000 if 'M' in text else 1000)
+        return str(int(number)) if number.is_integer() else repr(number)
+    return text
+
+
+def _closest_col(node):
+    """Nearest ancestor div with "col" in its class, else the parent (like closest('div[class*="col"]'))"""
+    current = node.parent
+    while current is not None:
+        if current.tag == 'div' and 'col' in (current.attributes.get('class') or ''):
+            return current
+        current = current.parent
+    return node.parent
+
+
+def _labelled_values(col):
+    """Yield (label, value) pairs from the <p><label>..</label> value</p> rows of a column"""
+    for p in col.css('p'):
+        label_el = p.css_first('label')
+        if label_el is None:
+            continue
+        label = label_el.text()
+        yield label.strip().lower(), p.text().replace(label, '', 1).strip()
+
+
+def _find_h5(tree, title: str):
+    """First <h5> whose trimmed, lowercased text equals title"""
+    for h5 in tree.css('h5'):
+        if h5.text().strip().lower() == title:
+            return h5
+    return None
+
 
 class PlayerScraper:
     """Handles extraction of player data from a single player page"""
@@ -12,13 +81,13 @@ class PlayerScraper:
     @staticmethod
     def extract_player_id(url: str) -> str:
         """Extract player ID from URL"""
-        match = re.search(r'/player/(\d+)/', url)
+        match = _PLAYER_ID_RE.search(url)
         return match.group(1) if match else ''
     
     @staticmethod
     def extract_version(url: str) -> str:
         """Extract version/roster from URL"""
-        match = re.search(r'/(\d+)/?$', url)
+        match = _VERSION_RE.search(url)
         return match.group(1) if match else ''
     
     @staticmethod
@@ -311,6 +380,173 @@ class PlayerScraper:
             }
         """)
         
+        return PlayerScraper._finalize(stats, url)
+    
+    @staticmethod
+    def parse_html(html: str, url: str) -> dict:
+        """
+        Parse a player page from raw HTML, without a browser
+        Mirrors the in-page script of scrape_player_data; requires selectolax
+        """
+        if HTMLParser is None:
+            raise ImportError("selectolax is required to parse player pages without a browser")
+        
+        tree = HTMLParser(html)
+        data = {}
+        
+        # Extract from meta description
+        meta_desc = tree.css_first('meta[name="description"]')
+        data['description'] = (meta_desc.attributes.get('content') or '') if meta_desc is not None else ''
+        
+        # Extract from JSON-LD schema
+        json_ld = tree.css_first('script[type="application/ld+json"]')
+        if json_ld is not None:
+            try:
+                schema = json.loads(json_ld.text())
+                data['full_name'] = f"{schema.get('givenName') or ''} {schema.get('familyName') or ''}".strip()
+                data['dob'] = schema.get('birthDate') or ''
+                data['image'] = schema.get('image') or ''
+                
+                # Parse height and weight
+                if schema.get('height'):
+                    data['height_cm'] = _extract_number(schema['height'])
+                if schema.get('weight'):
+                    data['weight_kg'] = _extract_number(schema['weight'])
+            except (ValueError, TypeError, AttributeError):
+                pass
+        
+        # Get player short name from header
+        data['name'] = _text(tree.css_first('h1.ellipsis'))
+        
+        # Get full name from profile if not from schema
+        if not data.get('full_name'):
+            full_name_el = tree.css_first('.profile h1')
+            if full_name_el is not None:
+                data['full_name'] = _text(full_name_el)
+        
+        # Extract version from select
+        data['version'] = _text(tree.css_first('#select-version option[selected]'))
+        
+        # Extract positions from profile
+        data['positions'] = ', '.join(_text(span) for span in tree.css('.profile .pos'))
+        
+        # Extract overall rating, potential, value, wage
+        for col in tree.css('.grid .col'):
+            sub = col.css_first('.sub')
+            em = col.css_first('em')
+            if sub is None or em is None:
+                continue
+            label = _text(sub).lower()
+            value = _text(em)
+            if 'overall' in label:
+                data['overall_rating'] = _extract_number(value)
+            elif 'potential' in label:
+                data['potential'] = _extract_number(value)
+            elif 'value' in label:
+                data['value'] = _parse_value(value)
+            elif 'wage' in label:
+                data['wage'] = _parse_value(value)
+        
+        # Extract profile attributes
+        for col in tree.css('.grid.attribute > .col'):
+            h5 = col.css_first('h5')
+            if h5 is None:
+                continue
+            section = _text(h5).lower()
+            
+            if section == 'profile':
+                for label, value in _labelled_values(col):
+                    if 'preferred foot' in label:
+                        data['preferred_foot'] = value
+                    elif 'weak foot' in label:
+                        data['weak_foot'] = _extract_number(value)
+                    elif 'skill moves' in label:
+                        data['skill_moves'] = _extract_number(value)
+                    elif 'international reputation' in label:
+                        data['international_reputation'] = _extract_number(value)
+                    elif 'body type' in label:
+                        data['body_type'] = value
+                    elif 'real face' in label:
+                        data['real_face'] = value
+                    elif 'release clause' in label:
+                        data['release_clause'] = _parse_value(value)
+            elif section == 'player specialities':
+                data['specialities'] = ', '.join(_text(a) for a in col.css('a'))
+            elif section in ('national team', 'club'):
+                prefix = 'country' if section == 'national team' else 'club'
+                
+                team_link = col.css_first('a[href*="/team/"]')
+                if team_link is not None:
+                    data[f'{prefix}_name'] = _text(team_link)
+                    match = _TEAM_ID_RE.search(team_link.attributes.get('href') or '')
+                    data[f'{prefix}_id'] = match.group(1) if match else ''
+                    if prefix == 'club':
+                        logo_img = team_link.css_first('img.avatar')
+                        if logo_img is not None:
+                            data['club_logo'] = logo_img.attributes.get('data-src') or logo_img.attributes.get('src') or ''
+                
+                league_link = col.css_first('a[href*="/league/"]')
+                if league_link is not None:
+                    data[f'{prefix}_league_name'] = _text(league_link)
+                    match = _LEAGUE_ID_RE.search(league_link.attributes.get('href') or '')
+                    data[f'{prefix}_league_id'] = match.group(1) if match else ''
+                
+                if prefix == 'country':
+                    flag_img = col.css_first('img.flag')
+                    if flag_img is not None:
+                        data['country_flag'] = flag_img.attributes.get('data-src') or flag_img.attributes.get('src') or ''
+                
+                # Extract rating (stars)
+                data[f'{prefix}_rating'] = str(len(col.css('svg.star')))
+                
+                # Extract position, kit number and, for clubs, joined and contract
+                for label, value in _labelled_values(col):
+                    if 'position' in label:
+                        data[f'{prefix}_position'] = value
+                    elif 'kit number' in label:
+                        data[f'{prefix}_kit_number'] = value
+                    elif prefix == 'club' and 'joined' in label:
+                        data['club_joined'] = value
+                    elif prefix == 'club' and 'contract' in label:
+                        data['club_contract_valid_until'] = value
+        
+        # Extract individual stats with category_attribute naming
+        for section_name in STAT_SECTIONS:
+            section_h5 = _find_h5(tree, section_name)
+            if section_h5 is None:
+                continue
+            container = _closest_col(section_h5)
+            if container is None:
+                continue
+            for p in container.css('p'):
+                em = p.css_first('em')
+                span = p.css_first('span[data-tippy-right-start]')
+                if em is None or span is None:
+                    continue
+                
+                # Normalize stat name to snake_case
+                normalized_name = re.sub(r'[^a-z0-9_]', '', re.sub(r'\s+', '_', _text(span).lower()))
+                
+                # Rename "att_position" to "att_positioning" for mentality
+                if normalized_name == 'att_position':
+                    normalized_name = 'att_positioning'
+                
+                data[f'{section_name}_{normalized_name}'] = _extract_number(_text(em))
+        
+        # Extract PlayStyles
+        play_styles_h5 = _find_h5(tree, 'playstyles')
+        if play_styles_h5 is not None:
+            container = _closest_col(play_styles_h5)
+            if container is not None:
+                # Remove the role-plus indicators
+                play_styles = [re.sub(r'\s*\+\+?\s*$', '', _text(span)) for span in container.css('span[data-tippy-right-start]')]
+                data['play_styles'] = ', '.join(play_styles)
+        
+        return PlayerScraper._finalize(data, url)
+    
+    @staticmethod
+    def _finalize(stats: dict, url: str) -> dict:
+        """Add player_id and URL, and normalize keys to lowercase snake_case"""
         # Add player_id and URL
         stats['player_id'] = PlayerScraper.extract_player_id(url)
         stats['url'] = url
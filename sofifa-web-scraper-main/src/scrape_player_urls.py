@@ -2,199 +2,398 @@
 SoFIFA Player URL Scraper
 Scrapes all player URLs from sofifa.com paginated list
 """
+import argparse
 import csv
 import asyncio
+import os
 import random
-from playwright.async_api import async_playwright
+import re
+from urllib.parse import urljoin
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import Stealth
+from browser_factory import CF_CHALLENGE_JS, CF_PENDING_JS, LAUNCH_ARGS, context_options, launch_stealth_browser
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Player profile links and the "Next" pagination button in raw listing HTML
+PLAYER_HREF_RE = re.compile(r'href="(/player/\d+/[^"]+)"')
+NEXT_BUTTON_RE = re.compile(r'<a\b[^>]*class="[^"]*\bbutton\b[^"]*"[^>]*>(?:(?!</a>).)*?Next', re.DOTALL)
+
+# Cloudflare challenge markers in raw listing HTML
+_CF_RE = re.compile(r"Checking your browser|Just a moment|cf-browser-verification|challenge-platform")
+
+# Requests aborted by the page router: heavy resource types and analytics/tracking hosts
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'stylesheet', 'font', 'media', 'websocket', 'manifest', 'other'})
+TRACKER_URL_RE = re.compile(r'google-analytics|googletagmanager|doubleclick|sentry|hotjar')
+
+# Random gap (min, max seconds) between consecutive listing requests to sofifa.com,
+# kept by all workers together rather than slept by each one
+REQUEST_INTERVAL = (0.2, 0.6)
+
+
+def block_unneeded_requests(route):
+    """Route handler aborting blocked resource types and tracker requests"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or TRACKER_URL_RE.search(request.url):
+        return route.abort()
+    return route.continue_()
 
 
 class PlayerURLScraper:
-    def __init__(self, base_url="https://sofifa.com/players?col=oa&sort=desc"):
+    def __init__(self, base_url="https://sofifa.com/players?col=oa&sort=desc", user_data_dir=None, storage_state_path=None, concurrency=8, output_file="player_urls.csv"):
         self.base_url = base_url
+        self.output_file = output_file
+        # Optional browser profile directory reused across runs (keeps Cloudflare clearance cookies and cache)
+        self.user_data_dir = user_data_dir
+        # Optional storage state file loaded at start and saved at exit
+        self.storage_state_path = storage_state_path
+        # Unique player URLs in listing order; _seen_urls makes the membership check O(1)
         self.all_player_urls = []
+        self._seen_urls = set()
+        # Output CSV kept open for appending; _written_count URLs are already in it
+        self._csv_file = None
+        self._csv_writer = None
+        self._written_count = 0
         self.offset = 0
         self.page_size = 60
+        # Number of listing pages scraped at the same time
+        self.concurrency = concurrency
+        self._lock = None
+        self._next_offset = 0
+        self._last_offset = None
+        # Pages scraped out of order, held until all earlier pages are stored
+        self._pending_pages = {}
+        self._stored_offset = -self.page_size
+        # Plain HTTP session reusing the browser's Cloudflare cookies (see _open_http_session)
+        self._http_session = None
+        # Browser pages for listings the HTTP session cannot fetch, opened on demand (see _acquire_page)
+        self._context = None
+        self._stealth = None
+        self._pages = None
+        self._page_count = 0
+        # Earliest loop time the next listing request may start (see _pace)
+        self._pace_lock = None
+        self._next_request_at = 0.0
 
     async def scrape_all_player_urls(self):
         """Scrape all player URLs from paginated list"""
         async with async_playwright() as p:
-            # Enhanced browser launch with comprehensive anti-detection
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-infobars',
-                    '--window-size=1920,1080',
-                    '--start-maximized',
-                    '--disable-extensions',
-                    '--disable-gpu',
-                    '--disable-notifications'
-                ]
-            )
+            options = context_options()
             
-            # More realistic user agent (latest Chrome)
-            user_agents = [
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
-            ]
+            browser = None
+            if self.user_data_dir:
+                # Persistent profile: starts with the cookies and cache of the previous run,
+                # so an already-passed Cloudflare challenge is not solved again
+                context = await p.chromium.launch_persistent_context(
+                    self.user_data_dir,
+                    headless=True,
+                    args=list(LAUNCH_ARGS),
+                    **options
+                )
+            else:
+                # Enhanced browser launch with comprehensive anti-detection
+                browser = await launch_stealth_browser(p)
+                if self.storage_state_path and os.path.isfile(self.storage_state_path):
+                    options['storage_state'] = self.storage_state_path
+                context = await browser.new_context(**options)
             
-            context = await browser.new_context(
-                user_agent=random.choice(user_agents),
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='America/New_York',
-                permissions=['geolocation'],
-                geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Sec-Fetch-User': '?1',
-                    'sec-ch-ua': '"Chromium";v="131", "Not_A Brand";v="24"',
-                    'sec-ch-ua-mobile': '?0',
-                    'sec-ch-ua-platform': '"Windows"'
-                }
-            )
+            self._context = context
+            self._stealth = Stealth()
+            self._pages = asyncio.Queue()
+            self._lock = asyncio.Lock()
+            self._pace_lock = asyncio.Lock()
             
-            page = await context.new_page()
+            # Scrape the first page alone so the Cloudflare challenge is solved once for the context
+            page_data = await self._scrape_listing_page(0)
+            if page_data is not None:
+                await self._store_page(0, page_data['urls'])
+                if page_data['hasNext']:
+                    # Cloudflare is solved now; fetch the remaining listings without rendering them
+                    page = await self._acquire_page()
+                    try:
+                        self._http_session = await self._open_http_session(context, page)
+                    finally:
+                        self._pages.put_nowait(page)
+                    # The listing has no total count, so workers claim offsets in order
+                    # until a page without a "Next" button marks the end
+                    self._next_offset = self.page_size
+                    await asyncio.gather(*(self._pagination_worker() for _ in range(self.concurrency)))
             
-            # Apply stealth mode to evade detection
-            stealth = Stealth()
-            await stealth.apply_stealth_async(page)
+            if self._http_session is not None:
+                await self._http_session.close()
+                self._http_session = None
             
-            # Block images, stylesheets, fonts to optimize loading
-            await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_())
+            # Save cookies (including Cloudflare clearance) for the next run
+            if self.storage_state_path:
+                await context.storage_state(path=self.storage_state_path)
             
-            page_num = 1
-            has_next = True
+            await context.close()
+            if browser:
+                await browser.close()
             
-            while has_next:
-                url = f"{self.base_url}&offset={self.offset}" if self.offset > 0 else self.base_url
-                
-                retries = 0
-                max_retries = 3
-                success = False
-                
-                while retries < max_retries and not success:
-                    try:
-                        if retries > 0:
-                            # Exponential backoff with random jitter
-                            delay = (2 ** retries) + random.uniform(1, 5)
-                            print(f"  Retry {retries}/{max_retries} after {delay:.1f}s pause...")
-                            await asyncio.sleep(delay)
-                        
-                        # Random delay between requests (1-3 seconds)
-                        if page_num > 1:
-                            delay = random.uniform(1, 3)
-                            await asyncio.sleep(delay)
-                        
-                        print(f"\n[Page {page_num}] Scraping: {url}")
-                        
-                        # Navigate with longer timeout and wait for network idle
-                        await page.goto(url, wait_until="networkidle", timeout=30000)
-                        
-                        # Human-like random delay
-                        await page.wait_for_timeout(random.randint(2000, 4000))
-                        
-                        # Check for Cloudflare challenge
-                        page_content = await page.content()
-                        if 'Checking your browser' in page_content or 'Just a moment' in page_content or 'cf-browser-verification' in page_content or 'challenge-platform' in page_content:
-                            print("  ⚠ Cloudflare challenge detected, waiting...")
-                            # Wait longer for Cloudflare to resolve
-                            await page.wait_for_timeout(10000)
-                            # Check again after waiting
-                            page_content = await page.content()
-                            if 'Checking your browser' in page_content or 'Just a moment' in page_content:
-                                print("  ⚠ Cloudflare challenge still present")
-                                retries += 1
-                                continue
-                        
-                        # Extract player URLs from current page
-                        page_data = await page.evaluate("""
-                            () => {
-                                const urls = [];
-                                const links = document.querySelectorAll('a[href*="/player/"]');
-                                
-                                links.forEach(link => {
-                                    const href = link.href;
-                                    // Only get unique player profile URLs (not random links)
-                                    if (href && href.includes('/player/') && !href.includes('random') && !urls.includes(href)) {
-                                        urls.push(href);
-                                    }
-                                });
-                                
-                                // Check if "Next" button exists
-                                const nextButton = [...document.querySelectorAll('a.button')].find(a => a.textContent.includes('Next'));
-                                const hasNext = Boolean(nextButton);
-                                
-                                return { urls, hasNext };
-                            }
-                        """)
-                        
-                        player_urls = page_data['urls']
-                        has_next = page_data['hasNext']
-                        
-                        print(f"  ✓ Extracted {len(player_urls)} player URLs")
-                        print(f"  Next button exists: {has_next}")
-                        
-                        # Add to collection
-                        self.all_player_urls.extend(player_urls)
-                        
-                        # Save after each page
-                        self.save_urls_to_csv()
-                        
-                        success = True
-                        
-                        # Move to next page
-                        if has_next:
-                            self.offset += self.page_size
-                            page_num += 1
-                        
-                    except Exception as e:
-                        print(f"  ✗ Error: {str(e)}")
-                        retries += 1
-                        if retries >= max_retries:
-                            print(f"  ✗ Failed after {max_retries} retries")
-                            has_next = False  # Stop pagination on failure
+        return self.all_player_urls
+
+    async def _new_page(self, context, stealth):
+        """Open a new page with stealth mode and resource blocking applied"""
+        page = await context.new_page()
+        
+        # Apply stealth mode to evade detection
+        await stealth.apply_stealth_async(page)
+        
+        # Block images, stylesheets, fonts, media and trackers to optimize loading
+        await page.route("**/*", block_unneeded_requests)
+        return page
+
+    async def _acquire_page(self):
+        """Idle browser page, opening another one only while fewer than ``concurrency`` are open"""
+        if self._pages.empty() and self._page_count < self.concurrency:
+            self._page_count += 1
+            try:
+                return await self._new_page(self._context, self._stealth)
+            except BaseException:
+                self._page_count -= 1
+                raise
+        return await self._pages.get()
+
+    async def _pace(self):
+        """Wait until the next listing request may start, spacing requests to the host across all workers"""
+        async with self._pace_lock:
+            loop = asyncio.get_running_loop()
+            wait = self._next_request_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_request_at = loop.time() + random.uniform(*REQUEST_INTERVAL)
+
+    async def _pagination_worker(self):
+        """Claim listing offsets one by one and scrape them until the last page is known"""
+        while True:
+            async with self._lock:
+                offset = self._next_offset
+                if self._last_offset is not None and offset > self._last_offset:
+                    return
+                self._next_offset += self.page_size
             
-            await browser.close()
+            page_data = await self._scrape_listing_page(offset)
             
-        return self.all_player_urls
+            async with self._lock:
+                if page_data is None:
+                    # Stop pagination on failure
+                    self._mark_last_offset(offset - self.page_size)
+                    continue
+                if not page_data['hasNext']:
+                    self._mark_last_offset(offset)
+            await self._store_page(offset, page_data['urls'])
+
+    def _mark_last_offset(self, offset):
+        """Record that no page after ``offset`` should be scraped"""
+        if self._last_offset is None or offset < self._last_offset:
+            self._last_offset = offset
+
+    async def _store_page(self, offset, player_urls):
+        """Add a page's URLs to the collection, keeping the listing order across workers"""
+        async with self._lock:
+            self._pending_pages[offset] = player_urls
+            stored = False
+            while self._stored_offset + self.page_size in self._pending_pages:
+                self._stored_offset += self.page_size
+                if self._last_offset is not None and self._stored_offset > self._last_offset:
+                    # Page beyond the last listing page; not part of the results
+                    self._pending_pages.pop(self._stored_offset)
+                    continue
+                self.add_urls(self._pending_pages.pop(self._stored_offset))
+                self.offset = self._stored_offset
+                stored = True
+            
+            # Save after each page
+            if stored:
+                self.write_new_urls()
+
+    async def _open_http_session(self, context, page):
+        """Create an aiohttp session carrying the browser's user agent and cookies"""
+        if aiohttp is None:
+            return None
+        cookies = await context.cookies(self.base_url)
+        user_agent = await page.evaluate('navigator.userAgent')
+        headers = {
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Cookie': '; '.join(f"{c['name']}={c['value']}" for c in cookies)
+        }
+        return aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=30))
 
-    def save_urls_to_csv(self, filename="player_urls.csv"):
-        """Save all player URLs to CSV file"""
-        # Remove duplicates while preserving order
-        unique_urls = []
-        seen = set()
-        for url in self.all_player_urls:
-            if url not in seen:
-                seen.add(url)
-                unique_urls.append(url)
+    async def _fetch_listing_http(self, url):
+        """Fetch a listing page over plain HTTP; returns None if Cloudflare blocks the request"""
+        try:
+            async with self._http_session.get(url) as response:
+                if response.status != 200:
+                    return None
+                html = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        if _CF_RE.search(html):
+            return None
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['player_url'])
-            for url in unique_urls:
-                writer.writerow([url])
+        # Only get unique player profile URLs (not random links), in page order
+        urls = list(dict.fromkeys(
+            urljoin(url, href) for href in PLAYER_HREF_RE.findall(html) if 'random' not in href
+        ))
+        return {'urls': urls, 'hasNext': bool(NEXT_BUTTON_RE.search(html))}
+
+    async def _scrape_listing_page(self, offset):
+        """Scrape one listing page, returning its URLs and Next flag or None after repeated failures"""
+        url = f"{self.base_url}&offset={offset}" if offset > 0 else self.base_url
+        page_num = offset // self.page_size + 1
+        
+        retries = 0
+        max_retries = 3
+        
+        while retries < max_retries:
+            try:
+                if retries > 0:
+                    # Exponential backoff with random jitter
+                    delay = (2 ** retries) + random.uniform(1, 5)
+                    print(f"  Retry {retries}/{max_retries} after {delay:.1f}s pause...")
+                    await asyncio.sleep(delay)
+                
+                # Space requests to the host, not the attempts of each worker
+                await self._pace()
+                
+                print(f"\n[Page {page_num}] Scraping: {url}")
+                
+                if self._http_session is not None:
+                    page_data = await self._fetch_listing_http(url)
+                    if page_data is not None:
+                        print(f"  ✓ [Page {page_num}] Extracted {len(page_data['urls'])} player URLs (HTTP)")
+                        print(f"  [Page {page_num}] Next button exists: {page_data['hasNext']}")
+                        return page_data
+                    print("  ⚠ HTTP fetch blocked, falling back to the browser")
+                
+                # Only listings that need rendering hold a browser page
+                page = await self._acquire_page()
+                try:
+                    page_data = await self._render_listing_page(page, url)
+                finally:
+                    self._pages.put_nowait(page)
+                if page_data is None:
+                    retries += 1
+                    continue
+                
+                print(f"  ✓ [Page {page_num}] Extracted {len(page_data['urls'])} player URLs")
+                print(f"  [Page {page_num}] Next button exists: {page_data['hasNext']}")
+                return page_data
+                
+            except Exception as e:
+                print(f"  ✗ Error: {str(e)}")
+                retries += 1
+        
+        print(f"  ✗ [Page {page_num}] Failed after {max_retries} retries")
+        return None
+
+    async def _render_listing_page(self, page, url):
+        """Load a listing page in the browser; None while a Cloudflare challenge is still shown"""
+        # Navigate and wait only until the player links are in the DOM
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        try:
+            await page.wait_for_selector('a[href*="/player/"]', state='attached', timeout=10000)
+        except PlaywrightTimeoutError:
+            # No player links yet - most likely a Cloudflare challenge, checked below
+            pass
         
-        print(f"  💾 Saved {len(unique_urls)} unique URLs to {filename}")
+        # Check for Cloudflare challenge
+        if await page.evaluate(CF_CHALLENGE_JS):
+            print("  ⚠ Cloudflare challenge detected, waiting...")
+            # Wait longer for Cloudflare to resolve
+            await page.wait_for_timeout(10000)
+            # Check again after waiting
+            if await page.evaluate(CF_PENDING_JS):
+                print("  ⚠ Cloudflare challenge still present")
+                return None
+        
+        # Extract player URLs from current page
+        return await page.evaluate("""
+            () => {
+                const seen = new Set();
+                const links = document.querySelectorAll('a[href*="/player/"]');
+                
+                links.forEach(link => {
+                    const href = link.href;
+                    // Only get unique player profile URLs (not random links)
+                    if (href && href.includes('/player/') && !href.includes('random')) {
+                        seen.add(href);
+                    }
+                });
+                
+                // Check if "Next" button exists
+                const nextButton = [...document.querySelectorAll('a.button')].find(a => a.textContent.includes('Next'));
+                const hasNext = Boolean(nextButton);
+                
+                return { urls: [...seen], hasNext };
+            }
+        """)
+
+    def add_urls(self, player_urls):
+        """Add player URLs to the collection, skipping ones already collected"""
+        for url in player_urls:
+            if url not in self._seen_urls:
+                self._seen_urls.add(url)
+                self.all_player_urls.append(url)
+
+    def write_new_urls(self):
+        """Append URLs collected since the last write to the output CSV file"""
+        if self._csv_file is None:
+            self._csv_file = open(self.output_file, 'w', newline='', encoding='utf-8')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(['player_url'])
+        
+        new_urls = self.all_player_urls[self._written_count:]
+        self._csv_writer.writerows([url] for url in new_urls)
+        self._csv_file.flush()
+        self._written_count += len(new_urls)
+        
+        print(f"  💾 Saved {self._written_count} unique URLs to {self.output_file}")
+
+    def finalize_csv(self):
+        """Write any remaining URLs and close the output CSV file"""
+        self.write_new_urls()
+        self._csv_file.close()
+        self._csv_file = None
+        self._csv_writer = None
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="SoFIFA Player URL Scraper")
+    parser.add_argument(
+        "--user-data-dir",
+        default=None,
+        help="Browser profile directory to reuse across runs (keeps Cloudflare cookies and cache)"
+    )
+    parser.add_argument(
+        "--storage-state",
+        default=None,
+        help="Path to a Playwright storage state JSON file, loaded at start and saved at exit"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of listing pages to scrape at the same time"
+    )
+    return parser.parse_args()
 
 
 async def main():
     """Main function to run the URL scraper"""
-    scraper = PlayerURLScraper()
+    args = parse_args()
+    scraper = PlayerURLScraper(
+        user_data_dir=args.user_data_dir,
+        storage_state_path=args.storage_state,
+        concurrency=args.concurrency
+    )
     
     print("="*60)
     print("SoFIFA Player URL Scraper")
@@ -204,6 +403,7 @@ async def main():
     print("\nFeatures:")
     print("  - Headless mode (no browser window)")
     print("  - Resource blocking for faster loading")
+    print(f"  - {scraper.concurrency} listing pages scraped concurrently")
     print("  - Cloudflare retry with 10s backoff (3 retries)")
     print("  - Saves after each page")
     print("="*60)
@@ -211,13 +411,13 @@ async def main():
     await scraper.scrape_all_player_urls()
     
     # Final save
-    scraper.save_urls_to_csv()
+    scraper.finalize_csv()
     
     # Print summary
     print("\n" + "="*60)
     print("SCRAPING COMPLETED!")
     print("="*60)
-    print(f"Total unique player URLs: {len(set(scraper.all_player_urls))}")
+    print(f"Total unique player URLs: {len(scraper.all_player_urls)}")
     print(f"Total pages scraped: {(scraper.offset // scraper.page_size) + 1}")
     print("\nFile created:")
     print("  - player_urls.csv")
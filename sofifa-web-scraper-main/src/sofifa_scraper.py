@@ -5,273 +5,425 @@ Comprehensive scraper using modular PlayerScraper
 import argparse
 import csv
 import asyncio
+import gzip
+import itertools
+import logging
+import operator
+import os
 import random
-from playwright.async_api import async_playwright
-from playwright_stealth import Stealth
-from player_scraper import PlayerScraper
+import sys
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_factory import CF_CHALLENGE_JS, CF_PENDING_JS, EXTRA_HTTP_HEADERS, USER_AGENTS, launch_stealth_browser, new_stealth_context
+from player_scraper import HTMLParser, PlayerScraper
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+logger = logging.getLogger("sofifa")
+
+# Player name heading that PlayerScraper reads; once attached the page is usable
+PLAYER_READY_SELECTOR = 'h1.ellipsis'
+
+# Consecutive HTTP fast-path misses before every remaining player goes through the browser
+HTTP_FALLBACK_LIMIT = 5
+
+# Retry backoff: full jitter, uniform(0, min(MAX_BACKOFF, BASE * 2**retries)) seconds
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 30.0
+
+# Rows buffered in memory before they are handed to the CSV writer
+CSV_BATCH_SIZE = 64
+
+# Fixed output schema, in column order; keys outside it are reported and dropped
+CSV_COLUMNS = (
+    'player_id', 'version', 'name', 'full_name', 'description', 'image',
+    'height_cm', 'weight_kg', 'dob', 'positions', 'overall_rating', 'potential',
+    'value', 'wage', 'preferred_foot', 'weak_foot', 'skill_moves',
+    'international_reputation', 'body_type', 'real_face',
+    'release_clause', 'specialities', 'club_id', 'club_name', 'club_league_id',
+    'club_league_name', 'club_logo', 'club_rating', 'club_position',
+    'club_kit_number', 'club_joined', 'club_contract_valid_until',
+    'country_id', 'country_name', 'country_league_id', 'country_league_name',
+    'country_flag', 'country_rating', 'country_position', 'country_kit_number',
+    'attacking_crossing', 'attacking_finishing', 'attacking_heading_accuracy', 
+    'attacking_short_passing', 'attacking_volleys',
+    'skill_dribbling', 'skill_curve', 'skill_fk_accuracy', 'skill_long_passing', 
+    'skill_ball_control',
+    'movement_acceleration', 'movement_sprint_speed', 'movement_agility', 
+    'movement_reactions', 'movement_balance',
+    'power_shot_power', 'power_jumping', 'power_stamina', 'power_strength', 
+    'power_long_shots',
+    'mentality_aggression', 'mentality_interceptions',
+    'mentality_vision', 'mentality_penalties', 'mentality_composure',
+    'defending_defensive_awareness', 'defending_standing_tackle', 'defending_sliding_tackle',
+    'goalkeeping_gk_diving', 'goalkeeping_gk_handling', 'goalkeeping_gk_kicking', 
+    'goalkeeping_gk_positioning', 'goalkeeping_gk_reflexes',
+    'play_styles', 'url',
+    # SoFIFA labels this stat "Attack position"; it sorts after the priority
+    # columns in files written by earlier versions, so it stays last here too
+    'mentality_attack_position'
+)
+CSV_COLUMN_SET = frozenset(CSV_COLUMNS)
+CSV_DEFAULTS = dict.fromkeys(CSV_COLUMNS, '')
+
+
+class CSVSchemaError(ValueError):
+    """An existing output file does not match CSV_COLUMNS"""
+
+
+def _url_pid(url):
+    """Extract the player ID from a SoFIFA URL, or None"""
+    # Same extraction as the parser's player_id column, so resumed IDs always line up
+    return PlayerScraper.extract_player_id(url) or None
 
 
 class SoFIFAScraper:
     def __init__(self, player_urls_file="player_urls.csv", output_file="player_stats.csv"):
         self.player_urls_file = player_urls_file
         self.output_file = output_file
-        self.player_urls = []
+        self.player_url_count = 0
         self.player_stats = []
-        self.columns = None
+        self.columns = CSV_COLUMNS
+        self._unexpected_keys = set()
+        self._row_getter = operator.itemgetter(*CSV_COLUMNS)
         self.csv_initialized = False
         self.existing_player_ids = set()
+        self._csv_fh = None
+        self._csv_writer = None
+        self._pending_rows = []
+        # Plain HTTP client tried before the browser (see _try_http)
+        self._http_client = None
+        self._http_misses = 0
+        # Browser and context pool, launched on the first player the HTTP path cannot handle
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._contexts = []
+        self._pool = None
+        self._pool_size = 0
+        # Pause (min, max seconds) a worker takes after each scraped player
+        self.delay_range = (0.5, 1.5)
 
     def load_player_urls(self):
-        """Load player URLs from CSV file"""
-        print(f"Loading player URLs from {self.player_urls_file}...")
-        with open(self.player_urls_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            self.player_urls = [row[0] for row in reader if row]
+        """Count player URLs in the CSV file; the URLs themselves are streamed by _iter_urls"""
+        logger.info("Loading player URLs from %s...", self.player_urls_file)
+        self.player_url_count = sum(1 for _ in self._iter_urls())
         
-        print(f"Loaded {len(self.player_urls)} player URLs")
-        return self.player_urls
+        logger.info("Loaded %d player URLs", self.player_url_count)
+        return self.player_url_count
 
-    def load_existing_player_ids(self):
-        """Load player IDs that have already been scraped from the output CSV"""
-        import os
-        
-        if not os.path.isfile(self.output_file):
-            print(f"No existing output file found: {self.output_file}")
+    def _iter_urls(self):
+        """Yield player URLs from the CSV file one row at a time"""
+        with open(self.player_urls_file, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if row:
+                    yield row[0]
+
+    def _load_done_ids(self):
+        """
+        Read the player_id column of an existing output CSV into a set for resuming
+        Rows are appended in the existing file's column order; a file whose header
+        does not hold exactly the CSV_COLUMNS fields, or that cannot be read, raises
+        CSVSchemaError so a resumed run never appends under a different schema
+        """
+        if not os.path.isfile(self.output_file) or os.path.getsize(self.output_file) == 0:
+            logger.info("No existing output file found: %s", self.output_file)
             return set()
         
-        existing_ids = set()
+        done_ids = set()
         try:
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            with self._open_output('r') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                self._use_existing_header(header)
+                pid_index = header.index('player_id')
+                # Only the player_id cell of each row is looked at
                 for row in reader:
-                    if 'player_id' in row and row['player_id']:
-                        existing_ids.add(row['player_id'])
-            
-            print(f"Found {len(existing_ids)} existing players in {self.output_file}")
-            self.csv_initialized = True  # File exists, so CSV is already initialized
-        except Exception as e:
-            print(f"Error loading existing players: {e}")
+                    if len(row) > pid_index and row[pid_index]:
+                        done_ids.add(row[pid_index])
+        except (OSError, EOFError, UnicodeDecodeError, csv.Error) as e:
+            raise CSVSchemaError(f"Cannot read existing output {self.output_file} to resume: {e}") from e
         
-        return existing_ids
+        # File exists, so the header is already written
+        self.csv_initialized = True
+        logger.info("Found %d existing players in %s, resuming", len(done_ids), self.output_file)
+        return done_ids
     
-    @staticmethod
-    def extract_player_id_from_url(url):
-        """Extract player ID from SoFIFA URL"""
-        # URL format: https://sofifa.com/player/158023/lionel-messi
-        try:
-            parts = url.rstrip('/').split('/')
-            # Find 'player' in parts and get the next element
-            if 'player' in parts:
-                idx = parts.index('player')
-                if idx + 1 < len(parts):
-                    return parts[idx + 1]
-        except:
-            pass
-        return None
-
-    async def scrape_player_stats(self, max_players=None):
-        """Scrape detailed stats for each player"""
+    def _use_existing_header(self, header):
+        """Write rows in the column order of an existing output file with the same schema"""
+        if len(header) != len(CSV_COLUMNS) or set(header) != CSV_COLUMN_SET:
+            missing = ', '.join(sorted(CSV_COLUMN_SET.difference(header))) or '-'
+            extra = ', '.join(sorted(set(header) - CSV_COLUMN_SET)) or '-'
+            raise CSVSchemaError(
+                f"Header of {self.output_file} does not match CSV_COLUMNS "
+                f"(missing: {missing}; extra: {extra}); "
+                "move the file aside or pass a different --output-file to start a new one"
+            )
+        self.columns = tuple(header)
+        self._row_getter = operator.itemgetter(*self.columns)
+    
+    async def scrape_player_stats(self, max_players=None, max_concurrency=5, use_http=True, delay_range=None):
+        """
+        Scrape detailed stats for each player, up to ``max_concurrency`` players at a time
+        Each player is first fetched over plain HTTP and only rendered in the browser
+        when that response is a Cloudflare page or lacks the player stats
+        """
+        if delay_range is not None:
+            self.delay_range = delay_range
+        
         # Load existing player IDs to avoid re-scraping
-        self.existing_player_ids = self.load_existing_player_ids()
+        self.existing_player_ids = self._load_done_ids()
         
         async with async_playwright() as p:
-            # Enhanced browser launch with comprehensive anti-detection
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-infobars',
-                    '--window-size=1920,1080',
-                    '--start-maximized',
-                    '--disable-extensions',
-                    '--disable-gpu',
-                    '--disable-notifications'
-                ]
-            )
+            self._playwright = p
             
-            # More realistic user agent (latest Chrome)
-            user_agents = [
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
-            ]
+            if not self.player_url_count:
+                self.load_player_urls()
+            total = min(self.player_url_count, max_players) if max_players else self.player_url_count
             
-            context = await browser.new_context(
-                user_agent=random.choice(user_agents),
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='America/New_York',
-                permissions=['geolocation'],
-                geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Sec-Fetch-User': '?1',
-                    'sec-ch-ua': '"Chromium";v="131", "Not_A Brand";v="24"',
-                    'sec-ch-ua-mobile': '?0',
-                    'sec-ch-ua-platform': '"Windows"'
-                }
-            )
+            # URLs are streamed from the CSV; workers pull from one shared iterator
+            urls_to_scrape = itertools.islice(self._iter_urls(), max_players)
+            workers = max(1, min(max_concurrency, total))
             
-            page = await context.new_page()
+            # Long-lived contexts shared by all workers; the queue also bounds concurrency
+            self._pool = asyncio.Queue()
+            self._pool_size = workers
+            self._browser_lock = asyncio.Lock()
+            if use_http:
+                self._http_client = self._open_http_client(workers)
             
-            # Apply stealth mode to evade detection
-            stealth = Stealth()
-            await stealth.apply_stealth_async(page)
+            # One progress bar for all workers instead of per-URL [idx/total] lines
+            progress = tqdm(total=total, unit='player', desc='Players') if tqdm is not None else None
             
-            # Block images, stylesheets, fonts to optimize loading
-            await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_())
+            async def worker():
+                results = []
+                for url in urls_to_scrape:
+                    results.append(await self._scrape_one(url))
+                    if progress is not None:
+                        progress.update(1)
+                return results
             
-            urls_to_scrape = self.player_urls[:max_players] if max_players else self.player_urls
-            total = len(urls_to_scrape)
-            skipped = 0
+            tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # Stop the other workers before the client, contexts and browser are closed under them
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            finally:
+                if progress is not None:
+                    progress.close()
+                if self._http_client is not None:
+                    await self._http_client.aclose()
+                    self._http_client = None
+                for context, _ in self._contexts:
+                    await context.close()
+                self._contexts = []
+                if self._browser is not None:
+                    await self._browser.close()
+                    self._browser = None
             
-            for idx, url in enumerate(urls_to_scrape, 1):
-                # Check if player already exists
-                player_id = self.extract_player_id_from_url(url)
-                if player_id and player_id in self.existing_player_ids:
-                    print(f"\n[{idx}/{total}] ⏭ Skipping already scraped player ID: {player_id}")
-                    skipped += 1
-                    continue
-                
-                retries = 0
-                max_retries = 5
-                success = False
+            # Log summary of skipped players
+            skipped = sum(result == 'skipped' for worker_results in results for result in worker_results)
+            if skipped > 0:
+                logger.info("⏭ Skipped %d already scraped player(s)", skipped)
+
+    async def _make_context(self, browser, worker_id):
+        """Create a stealth browser context and its page, with a user agent fixed per worker"""
+        # A long-lived context keeps one user agent; UA churn looks suspicious to Cloudflare
+        context = await new_stealth_context(browser, user_agent=USER_AGENTS[worker_id % len(USER_AGENTS)])
+        page = await context.new_page()
+        return context, page
+
+    async def _acquire_context(self):
+        """Take a context from the pool, launching the browser and filling the pool on first use"""
+        async with self._browser_lock:
+            if self._browser is None:
+                # Enhanced browser launch with comprehensive anti-detection
+                self._browser = await launch_stealth_browser(self._playwright)
+                self._contexts = [await self._make_context(self._browser, worker_id) for worker_id in range(self._pool_size)]
+                for entry in self._contexts:
+                    self._pool.put_nowait(entry)
+        return await self._pool.get()
+
+    def _open_http_client(self, max_connections):
+        """Create the pooled HTTP client for the fast path, or None if httpx/selectolax are missing"""
+        if httpx is None or HTMLParser is None:
+            return None
+        
+        # Same browser-like headers as the Playwright contexts; httpx negotiates encoding itself
+        headers = {key: value for key, value in EXTRA_HTTP_HEADERS.items() if key not in ('Accept-Encoding', 'Connection')}
+        headers['User-Agent'] = USER_AGENTS[0]
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        try:
+            return httpx.AsyncClient(http2=True, headers=headers, timeout=15, limits=limits, follow_redirects=True)
+        except ImportError:
+            # h2 is not installed; fall back to pooled HTTP/1.1
+            return httpx.AsyncClient(headers=headers, timeout=15, limits=limits, follow_redirects=True)
+
+    async def _try_http(self, url):
+        """Fetch and parse a player page without the browser; None when the browser is needed"""
+        if self._http_client is None or self._http_misses >= HTTP_FALLBACK_LIMIT:
+            return None
+        
+        stats = None
+        try:
+            response = await self._http_client.get(url)
+            if response.status_code == 200:
+                stats = PlayerScraper.parse_html(response.text, url)
+        except Exception as e:
+            # Transport and parser errors alike are a miss; the browser path handles the page
+            logger.debug("HTTP fast path failed for %s: %r", url, e)
+        
+        # A Cloudflare page or a layout change leaves the essential fields empty
+        if stats is None or not (stats.get('name') and stats.get('overall_rating')):
+            self._http_misses += 1
+            if self._http_misses == HTTP_FALLBACK_LIMIT:
+                logger.warning("⚠ HTTP fast path keeps failing (likely Cloudflare), using the browser only")
+            return None
+        
+        self._http_misses = 0
+        return stats
+
+    async def _pace(self):
+        """Per-worker pause after a scraped player, so concurrent workers are not serialized"""
+        await asyncio.sleep(random.uniform(*self.delay_range))
+
+    def _record(self, stats):
+        """Store a scraped player and mark its ID as done"""
+        self.player_stats.append(stats)
+        logger.debug("✓ Extracted: %s (ID: %s)", stats.get('name', 'Unknown'), stats.get('player_id', 'N/A'))
+        # Save incrementally after each player
+        self.save_player_to_csv(stats)
+        # Add to existing IDs set to prevent duplicates in same run
+        if stats.get('player_id'):
+            self.existing_player_ids.add(stats['player_id'])
+
+    async def _scrape_one(self, url):
+        """Scrape a single player over HTTP or on a pooled context; returns 'skipped', 'scraped' or 'failed'"""
+        # Check if player already exists
+        player_id = _url_pid(url)
+        if player_id and player_id in self.existing_player_ids:
+            logger.debug("⏭ Skipping already scraped player ID: %s", player_id)
+            return 'skipped'
+        
+        # Fast path: server-rendered page fetched and parsed without a browser
+        stats = await self._try_http(url)
+        if stats is not None:
+            logger.debug("Fetched player over HTTP: %s", url)
+            self._record(stats)
+            await self._pace()
+            return 'scraped'
+        
+        context, page = await self._acquire_context()
+        try:
+            retries = 0
+            max_retries = 5
+            
+            while retries < max_retries:
+                try:
+                    if retries > 0:
+                        # Capped exponential backoff with full jitter
+                        delay = random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * (2 ** retries)))
+                        logger.info("Retry %d/%d for %s after %.1fs pause...", retries, max_retries, url, delay)
+                        await asyncio.sleep(delay)
+                    
+                    logger.debug("Scraping player: %s", url)
                 
-                while retries < max_retries and not success:
+                    # Navigate and wait only for the player heading to render
+                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
                     try:
-                        if retries > 0:
-                            # Exponential backoff with random jitter
-                            delay = (2 ** retries) + random.uniform(1, 5)
-                            print(f"  Retry {retries}/{max_retries} after {delay:.1f}s pause...")
-                            await asyncio.sleep(delay)
-                        
-                        # Random delay between requests (1-3 seconds)
-                        if idx > 1:
-                            delay = random.uniform(1, 3)
-                            await asyncio.sleep(delay)
-                        
-                        print(f"\n[{idx}/{total}] Scraping player: {url}")
+                        await page.wait_for_selector(PLAYER_READY_SELECTOR, state='attached', timeout=15000)
+                        ready = True
+                    except PlaywrightTimeoutError:
+                        ready = False
                     
-                        # Navigate with longer timeout and wait for network idle
-                        await page.goto(url, wait_until="networkidle", timeout=30000)
-                        
-                        # Human-like random delay
-                        await page.wait_for_timeout(random.randint(2000, 4000))
-                        
-                        # Check for Cloudflare challenge
-                        page_content = await page.content()
-                        if 'Checking your browser' in page_content or 'Just a moment' in page_content or 'cf-browser-verification' in page_content or 'challenge-platform' in page_content:
-                            print("  ⚠ Cloudflare challenge detected, waiting...")
+                    # Check for Cloudflare challenge only when the player heading never showed up
+                    if not ready:
+                        if await page.evaluate(CF_CHALLENGE_JS):
+                            logger.warning("⚠ Cloudflare challenge detected on %s, waiting...", url)
                             # Wait longer for Cloudflare to resolve
                             await page.wait_for_timeout(10000)
                             # Check again after waiting
-                            page_content = await page.content()
-                            if 'Checking your browser' in page_content or 'Just a moment' in page_content:
-                                print("  ⚠ Cloudflare challenge still present")
+                            if await page.evaluate(CF_PENDING_JS):
+                                logger.warning("⚠ Cloudflare challenge still present on %s", url)
                                 retries += 1
                                 continue
+                    
+                    # Extract player stats using modular scraper
+                    stats = await PlayerScraper.scrape_player_data(page, url)
+                    
+                    if stats.get('name'):
+                        self._record(stats)
+                        await self._pace()
+                        return 'scraped'
+                    
+                    logger.warning("✗ No data extracted from %s", url)
+                    retries += 1
                         
-                        # Extract player stats using modular scraper
-                        stats = await PlayerScraper.scrape_player_data(page, url)
-                        
-                        if stats.get('name'):
-                            self.player_stats.append(stats)
-                            print(f"  ✓ Extracted: {stats.get('name', 'Unknown')} (ID: {stats.get('player_id', 'N/A')})")
-                            # Save incrementally after each player
-                            self.save_player_to_csv(stats)
-                            # Add to existing IDs set to prevent duplicates in same run
-                            if stats.get('player_id'):
-                                self.existing_player_ids.add(stats['player_id'])
-                            success = True
-                        else:
-                            print("  ✗ No data extracted")
-                            retries += 1
-                            
-                    except Exception as e:
-                        print(f"  ✗ Error: {str(e)}")
-                        retries += 1
-                
-                if not success:
-                    print(f"  ✗ Failed after {max_retries} retries, skipping...")
+                except Exception as e:
+                    logger.warning("✗ Error on %s: %s", url, e)
+                    retries += 1
             
-            await browser.close()
-            
-            # Print summary of skipped players
-            if skipped > 0:
-                print(f"\n⏭ Skipped {skipped} already scraped player(s)")
-
-    def _get_column_order(self, stats_dict):
-        """Define and return the column order for CSV"""
-        priority_cols = [
-            'player_id', 'version', 'name', 'full_name', 'description', 'image',
-            'height_cm', 'weight_kg', 'dob', 'positions', 'overall_rating', 'potential',
-            'value', 'wage', 'preferred_foot', 'weak_foot', 'skill_moves',
-            'international_reputation', 'body_type', 'real_face',
-            'release_clause', 'specialities', 'club_id', 'club_name', 'club_league_id',
-            'club_league_name', 'club_logo', 'club_rating', 'club_position',
-            'club_kit_number', 'club_joined', 'club_contract_valid_until',
-            'country_id', 'country_name', 'country_league_id', 'country_league_name',
-            'country_flag', 'country_rating', 'country_position', 'country_kit_number',
-            'attacking_crossing', 'attacking_finishing', 'attacking_heading_accuracy', 
-            'attacking_short_passing', 'attacking_volleys',
-            'skill_dribbling', 'skill_curve', 'skill_fk_accuracy', 'skill_long_passing', 
-            'skill_ball_control',
-            'movement_acceleration', 'movement_sprint_speed', 'movement_agility', 
-            'movement_reactions', 'movement_balance',
-            'power_shot_power', 'power_jumping', 'power_stamina', 'power_strength', 
-            'power_long_shots',
-            'mentality_aggression', 'mentality_interceptions', 'mentality_att_positioning', 
-            'mentality_vision', 'mentality_penalties', 'mentality_composure',
-            'defending_defensive_awareness', 'defending_standing_tackle', 'defending_sliding_tackle',
-            'goalkeeping_gk_diving', 'goalkeeping_gk_handling', 'goalkeeping_gk_kicking', 
-            'goalkeeping_gk_positioning', 'goalkeeping_gk_reflexes',
-            'play_styles', 'url'
-        ]
-        
-        # Add priority columns first, then any additional columns
-        all_keys = set(stats_dict.keys())
-        other_cols = sorted([col for col in all_keys if col not in priority_cols])
-        columns = [col for col in priority_cols if col in all_keys] + other_cols
-        return columns
-    
+            logger.error("✗ %s failed after %d retries, skipping...", url, max_retries)
+            return 'failed'
+        finally:
+            self._pool.put_nowait((context, page))
+
     def save_player_to_csv(self, stats):
         """Save a single player's stats to CSV file incrementally"""
-        import os
+        # Report keys outside the fixed schema once, then drop them
+        unexpected = stats.keys() - CSV_COLUMN_SET - self._unexpected_keys
+        if unexpected:
+            logger.warning("⚠ Ignoring unexpected column(s): %s", ', '.join(sorted(unexpected)))
+            self._unexpected_keys.update(unexpected)
         
-        # Check if file exists
-        file_exists = os.path.isfile(self.output_file) and self.csv_initialized
+        if self._csv_writer is None:
+            # Open the output once, on first write: append to an existing file,
+            # otherwise start a new one with a header
+            mode = 'a' if self.csv_initialized else 'w'
+            self._csv_fh = self._open_output(mode)
+            self._csv_writer = csv.writer(self._csv_fh)
+            if not self.csv_initialized:
+                self._csv_writer.writerow(self.columns)
+                self.csv_initialized = True
         
-        # Initialize columns on first write
-        if self.columns is None:
-            self.columns = self._get_column_order(stats)
-        
-        # Write to CSV
-        mode = 'a'
-        if not self.csv_initialized:
-            mode = 'w'
-            self.csv_initialized = True
-
-        with open(self.output_file, mode, newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.columns)
-            
-            # Write header only if file doesn't exist
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(stats)
+        # Project onto the schema as a tuple; missing fields become empty cells
+        self._pending_rows.append(self._row_getter({**CSV_DEFAULTS, **stats}))
+        if len(self._pending_rows) >= CSV_BATCH_SIZE:
+            self._flush_rows()
+
+    def _open_output(self, mode):
+        """Open the output CSV in text mode, gzip-compressed when the file name ends in .gz"""
+        if self.output_file.endswith('.gz'):
+            # Level 1 keeps the CPU cost low; appending adds a new gzip member, which readers handle
+            return gzip.open(self.output_file, mode + 't', newline='', encoding='utf-8', compresslevel=1)
+        return open(self.output_file, mode, newline='', encoding='utf-8', buffering=1 << 20)
+
+    def _flush_rows(self):
+        """Write buffered rows to the CSV writer"""
+        if self._pending_rows:
+            self._csv_writer.writerows(self._pending_rows)
+            self._pending_rows.clear()
+
+    def close(self):
+        """Flush and close the output CSV file"""
+        if self._csv_fh is not None:
+            self._flush_rows()
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._csv_writer = None
 
 
 def parse_args():
@@ -293,12 +445,40 @@ def parse_args():
         default="player_stats.csv",
         help="Path to the CSV file for saving player stats"
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=5,
+        help="Number of player pages to scrape at the same time"
+    )
+    parser.add_argument(
+        "--delay-range",
+        type=float,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=(0.5, 1.5),
+        help="Random pause in seconds each worker takes after a scraped player"
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level on stderr; DEBUG also logs every player"
+    )
+    parser.add_argument(
+        "--browser-only",
+        action="store_true",
+        help="Skip the plain HTTP fast path and render every player page in the browser"
+    )
     return parser.parse_args()
 
 
 async def main():
     """Main function to run the scraper"""
     args = parse_args()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr)
+    # httpx logs every request at INFO; keep that out of the scraper log
+    logging.getLogger("httpx").setLevel(logging.WARNING)
     scraper = SoFIFAScraper(
         player_urls_file=args.player_urls_file,
         output_file=args.output_file
@@ -315,20 +495,28 @@ async def main():
     print("Scraping detailed stats for each player")
     print("="*60)
     
-    print(f"\nTotal players to scrape: {len(scraper.player_urls)}")
+    print(f"\nTotal players to scrape: {scraper.player_url_count}")
     print("Note: Scraping all players may take a long time.")
     
     # Set to None to scrape all players, or set a number to limit
     if args.max_players:
         print(f"Limiting to first {args.max_players} players...")
     
-    await scraper.scrape_player_stats(max_players=args.max_players)
+    try:
+        await scraper.scrape_player_stats(
+            max_players=args.max_players,
+            max_concurrency=args.max_concurrency,
+            use_http=not args.browser_only,
+            delay_range=tuple(args.delay_range)
+        )
+    finally:
+        scraper.close()
     
     # Print summary
     print("\n" + "="*60)
     print("SCRAPING COMPLETED!")
     print("="*60)
-    print(f"Total player URLs loaded: {len(scraper.player_urls)}")
+    print(f"Total player URLs loaded: {scraper.player_url_count}")
     print(f"Already scraped (skipped): {len(scraper.existing_player_ids)}")
     print(f"Newly scraped this run: {len(scraper.player_stats)}")
     print("\nFile created:")
@@ -4,6 +4,7 @@ Tests URL scraping + player data scraping
 """
 import sys
 import asyncio
+import logging
 from pathlib import Path
 
 # Add src directory to path
@@ -33,17 +34,21 @@ async def test_integration():
     scraper.load_player_urls()
     
     # Scrape only first 2 players
-    await scraper.scrape_player_stats(max_players=2)
+    try:
+        await scraper.scrape_player_stats(max_players=2)
+    finally:
+        scraper.close()
     
     print("\n" + "="*60)
     print("INTEGRATION TEST COMPLETED!")
     print("="*60)
-    print(f"URLs loaded: {len(scraper.player_urls)}")
+    print(f"URLs loaded: {scraper.player_url_count}")
     print(f"Player stats scraped: {len(scraper.player_stats)}")
     print(f"\nFiles created:")
-    print(f"  - test_player_urls.csv ({len(scraper.player_urls)} URLs)")
+    print(f"  - test_player_urls.csv ({scraper.player_url_count} URLs)")
     print(f"  - test_player_stats.csv ({len(scraper.player_stats)} players)")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
     asyncio.run(test_integration())
@@ -5,15 +5,15 @@ Tests scraping of a single player (Lionel Messi)
 import asyncio
 import json
 import sys
-import random
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from playwright.async_api import async_playwright
-from playwright_stealth import Stealth
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_factory import CF_CHALLENGE_JS, CF_PENDING_JS, launch_stealth_browser, new_stealth_context
 from player_scraper import PlayerScraper
+from sofifa_scraper import CSV_COLUMN_SET
 
 
 async def test_single_player():
@@ -27,76 +27,26 @@ async def test_single_player():
     print("\nStarting browser...")
     
     async with async_playwright() as p:
-        # Enhanced browser launch with comprehensive anti-detection
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--disable-infobars',
-                '--window-size=1920,1080',
-                '--start-maximized',
-                '--disable-extensions',
-                '--disable-gpu',
-                '--disable-notifications'
-            ]
-        )
-        
-        # More realistic user agent
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
-        ]
-        
-        context = await browser.new_context(
-            user_agent=random.choice(user_agents),
-            viewport={'width': 1920, 'height': 1080},
-            locale='en-US',
-            timezone_id='America/New_York',
-            permissions=['geolocation'],
-            geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-            extra_http_headers={
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'sec-ch-ua': '"Chromium";v="131", "Not_A Brand";v="24"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"'
-            }
-        )
-        
+        # Stealth browser and context from the shared factory
+        browser = await launch_stealth_browser(p)
+        context = await new_stealth_context(browser)
         page = await context.new_page()
         
-        # Apply stealth mode to evade detection
-        stealth = Stealth()
-        await stealth.apply_stealth_async(page)
-        
-        # Block images, stylesheets, fonts to optimize loading
-        await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_())
-        
         print("Navigating to player page...")
-        await page.goto(test_url, wait_until="networkidle", timeout=30000)
+        await page.goto(test_url, wait_until="domcontentloaded", timeout=30000)
         
-        # Human-like delay
-        await page.wait_for_timeout(random.randint(2000, 4000))
+        # Wait for the player heading instead of a fixed delay
+        try:
+            await page.wait_for_selector('h1.ellipsis', state='attached', timeout=15000)
+            challenged = False
+        except PlaywrightTimeoutError:
+            challenged = await page.evaluate(CF_CHALLENGE_JS)
         
         # Check for Cloudflare challenge
-        page_content = await page.content()
-        if 'Checking your browser' in page_content or 'Just a moment' in page_content or 'challenge-platform' in page_content:
+        if challenged:
             print("⚠ Cloudflare challenge detected, waiting for resolution...")
             await page.wait_for_timeout(10000)
-            page_content = await page.content()
-            if 'Checking your browser' in page_content or 'Just a moment' in page_content:
+            if await page.evaluate(CF_PENDING_JS):
                 print("⚠ Cloudflare challenge still present - test may fail")
         else:
             print("✓ No Cloudflare challenge detected")
@@ -130,7 +80,7 @@ async def test_single_player():
             "movement_reactions", "movement_balance",
             "power_shot_power", "power_jumping", "power_stamina", "power_strength", 
             "power_long_shots",
-            "mentality_aggression", "mentality_interceptions", "mentality_att_positioning", 
+            "mentality_aggression", "mentality_interceptions", "mentality_attack_position", 
             "mentality_vision", "mentality_penalties", "mentality_composure",
             "defending_defensive_awareness", "defending_standing_tackle", "defending_sliding_tackle",
             "goalkeeping_gk_diving", "goalkeeping_gk_handling", "goalkeeping_gk_kicking", 
@@ -157,6 +107,11 @@ async def test_single_player():
         if missing_fields:
             print(f"\nMissing fields: {', '.join(missing_fields)}")
         
+        # Every parsed key must have a CSV column, or it would be dropped on save
+        unknown_fields = sorted(player_data.keys() - CSV_COLUMN_SET)
+        assert not unknown_fields, f"Parsed fields missing from CSV_COLUMNS: {', '.join(unknown_fields)}"
+        print("✓ All parsed fields are in the CSV schema")
+        
         # Print sample data
         print("\n" + "="*60)
         print("SAMPLE DATA")
@@ -165,7 +120,7 @@ async def test_single_player():
         sample_fields = [
             "player_id", "name", "full_name", "overall_rating", "potential",
             "positions", "club_name", "country_name", "attacking_crossing", "attacking_finishing",
-            "skill_dribbling", "mentality_att_positioning", "play_styles"
+            "skill_dribbling", "mentality_attack_position", "play_styles"
         ]
         
         for field in sample_fields:
@@ -16,14 +16,24 @@ from __future__ import annotations
 import argparse
 import asyncio
 import csv
+import hashlib
+import os
 import random
 import re
+import shutil
+import sys
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import Stealth
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
 
 @dataclass(frozen=True)
 class TabSpec:
@@ -31,7 +41,131 @@ class TabSpec:
     tab_link_selector: str
     container_selector: str
     paging_selector: str
-
+    # Shown right after navigation, so its table needs no click
+    active_on_load: bool = False
+
+
+# Built once: the stealth payload is a multi-KB script regenerated on every access
+_STEALTH_SCRIPT = Stealth().script_payload
+
+T = TypeVar("T")
+
+# Transient Playwright failures are retried per page load and per tab with exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+
+# Where cookies are saved after the first successful page and loaded from on the next run
+DEFAULT_STORAGE_STATE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "whoscored", "storage.json")
+
+# URLs scraped in one browser context before it is closed and replaced
+CONTEXT_MAX_USES = 10
+
+# Leading CSV columns of every row, ahead of the tab's stat columns
+BASE_COLUMNS: Tuple[str, ...] = (
+    "source_url",
+    "tab",
+    "page",
+    "player_name",
+    "player_url",
+    "team_name",
+    "team_url",
+    "player_age",
+    "player_positions",
+)
+
+# The XHR behind each stats tab (StatisticsFeed/.../GetPlayerStatistics)
+_STATS_FEED_RE = re.compile(r"statistics(?:data|feed)", re.IGNORECASE)
+# How long to wait for the feed response once the tab's table is on screen
+FEED_WAIT_SECONDS = 2.0
+# Feed field and decimal places behind each normalized table column, per tab, so
+# feed rows land in the same columns and formats the table shows. Hand-written from
+# the playerTableStats record fields, not generated from a recorded payload, so the
+# first feed page is compared cell for cell with the table on screen before the feed
+# is used (see _scrape_tab_feed). Tabs missing here, whose table has a column missing
+# here, or whose feed rows differ from the table are read from the table instead
+_APPS = ("apps", 0)
+_MINS = ("minsPlayed", 0)
+_GOALS = ("goal", 0)
+_ASSISTS = ("assistTotal", 0)
+_SHOTS = ("shotsPerGame", 1)
+_PASS_SUCCESS = ("passSuccess", 1)
+_KEY_PASSES = ("keyPassPerGame", 1)
+_RATING = ("rating", 2)
+_FEED_FIELDS: Dict[str, Dict[str, Tuple[str, int]]] = {
+    "summary": {
+        "apps": _APPS,
+        "mins": _MINS,
+        "goals": _GOALS,
+        "assists": _ASSISTS,
+        "yel": ("yellowCard", 0),
+        "red": ("redCard", 0),
+        "spg": _SHOTS,
+        "ps": _PASS_SUCCESS,
+        "aerialswon": ("aerialWonPerGame", 1),
+        "motm": ("manOfTheMatch", 0),
+        "rating": _RATING,
+    },
+    "defensive": {
+        "apps": _APPS,
+        "mins": _MINS,
+        "tackles": ("tacklePerGame", 1),
+        "inter": ("interceptionPerGame", 1),
+        "fouls": ("foulsPerGame", 1),
+        "offsides": ("offsideWonPerGame", 1),
+        "clear": ("clearancePerGame", 1),
+        "drb": ("wasDribbledPerGame", 1),
+        "blocks": ("outfielderBlockPerGame", 1),
+        "owng": ("goalOwn", 0),
+        "rating": _RATING,
+    },
+    "offensive": {
+        "apps": _APPS,
+        "mins": _MINS,
+        "goals": _GOALS,
+        "assists": _ASSISTS,
+        "spg": _SHOTS,
+        "keyp": _KEY_PASSES,
+        "drb": ("dribbleWonPerGame", 1),
+        "fouled": ("foulGivenPerGame", 1),
+        "off": ("offsideGivenPerGame", 1),
+        "disp": ("dispossessedPerGame", 1),
+        "unstch": ("turnoverPerGame", 1),
+        "rating": _RATING,
+    },
+    "passing": {
+        "apps": _APPS,
+        "mins": _MINS,
+        "assists": _ASSISTS,
+        "keyp": _KEY_PASSES,
+        "avgp": ("totalPassesPerGame", 1),
+        "ps": _PASS_SUCCESS,
+        "crosses": ("accurateCrossesPerGame", 1),
+        "longb": ("accurateLongPassPerGame", 1),
+        "thrb": ("accurateThroughBallPerGame", 1),
+        "rating": _RATING,
+    },
+}
+# Text cleanup patterns used for every header and cell
+_WS_RE = re.compile(r"\s+")
+_PCT_RE = re.compile(r"[%/]+")
+_NONALNUM_RE = re.compile(r"[^a-z0-9\s]+")
+_AGE_RE = re.compile(r"\b(\d{2})\b")
+_LEADING_COMMA_RE = re.compile(r"^,?\s*")
+
+_CF_MARKERS = (
+    "Checking your browser",
+    "Just a moment",
+    "cf-browser-verification",
+    "challenge-platform",
+)
+_CF_RE = re.compile("|".join(map(re.escape, _CF_MARKERS)))
+# Status codes Cloudflare serves its interstitial with
+_CF_STATUSES = frozenset({403, 503})
+
+# Requests dropped by the context router: heavy resource types and trackers
+BLOCK_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media", "other"})
+BLOCK_HOSTS = ("google-analytics", "doubleclick", "googletagmanager", "hotjar")
+_BLOCKED_ASSET_GLOB = "**/*.{png,jpg,jpeg,gif,svg,webp,woff,woff2,ttf,css}"
 
 TABS: List[TabSpec] = [
     TabSpec(
@@ -39,6 +173,7 @@ TABS: List[TabSpec] = [
         tab_link_selector="#stage-top-player-stats-options a[href=\"#stage-top-player-stats-summary\"]",
         container_selector="#stage-top-player-stats-summary",
         paging_selector="#statistics-paging-summary",
+        active_on_load=True,
     ),
     TabSpec(
         name="defensive",
@@ -74,30 +209,270 @@ TABS: List[TabSpec] = [
 
 
 def _clean_text(value: str) -> str:
-    return re.sub(r"\s+", " ", value or "").strip()
+    return _WS_RE.sub(" ", value or "").strip()
 
 
 def _normalize_header(header: str) -> str:
     normalized = header.strip().lower()
-    normalized = re.sub(r"[%/]+", " ", normalized)
-    normalized = re.sub(r"[^a-z0-9\s]+", " ", normalized)
-    normalized = re.sub(r"\s+", "_", normalized).strip("_")
+    normalized = _PCT_RE.sub(" ", normalized)
+    normalized = _NONALNUM_RE.sub(" ", normalized)
+    normalized = _WS_RE.sub("_", normalized).strip("_")
     return normalized
 
 
 def _dedupe_headers(headers: Iterable[str]) -> List[str]:
+    # Interned so the per-row dict stores and CSV lookups hit the identity fast path
     seen: Dict[str, int] = {}
     result: List[str] = []
     for header in headers:
-        if header not in seen:
+        count = seen.get(header)
+        if count is None:
             seen[header] = 1
-            result.append(header)
-            continue
-        seen[header] += 1
-        result.append(f"{header}_{seen[header]}")
+            result.append(sys.intern(header))
+        else:
+            seen[header] = count + 1
+            result.append(sys.intern(f"{header}_{count + 1}"))
     return result
 
 
+def _entity_url(base_url: str, kind: str, entity_id, name: str) -> str:
+    """Rebuild a table link such as /Players/11119/Show/Lionel-Messi from feed fields."""
+    if not entity_id:
+        return ""
+    return urljoin(base_url, f"/{kind}/{entity_id}/Show/{_clean_text(name).replace(' ', '-')}")
+
+
+def _feed_cell(record: Dict, field: str, decimals: int) -> str:
+    """Format a feed value the way the table shows it: zero as "-", fixed decimals."""
+    value = record.get(field)
+    if field == "apps" and record.get("subOn"):
+        # The table shows starts and substitute appearances as "12(3)"
+        return f"{value or 0}({record['subOn']})"
+    if not value:
+        return "-"
+    if decimals:
+        return f"{float(value):.{decimals}f}"
+    return str(value)
+
+
+def _feed_rows(
+    records: List[Dict],
+    url: str,
+    tab: TabSpec,
+    current_page: int,
+    fields: List[Tuple[str, int]],
+) -> List[Tuple[str, ...]]:
+    """Return feed records as rows aligned to the table's columns, one (field, decimals) per stat column."""
+    page_prefix = (url, tab.name, str(current_page))
+    rows: List[Tuple[str, ...]] = []
+    for record in records:
+        name = _clean_text(str(record.get("name") or ""))
+        team_name = _clean_text(str(record.get("teamName") or ""))
+        # Team links carry the region too, e.g. /Teams/65/Show/Spain-Barcelona
+        team_slug = " ".join(filter(None, (str(record.get("teamRegionName") or ""), team_name)))
+        rows.append(
+            page_prefix
+            + (
+                name,
+                _entity_url(url, "Players", record.get("playerId"), name),
+                team_name,
+                _entity_url(url, "Teams", record.get("teamId"), team_slug),
+                str(record.get("age") or ""),
+                _clean_text(str(record.get("playedPositionsShort") or "")),
+            )
+            + tuple(_feed_cell(record, field, decimals) for field, decimals in fields)
+        )
+    return rows
+
+
+def _table_rows(
+    table_data: Dict[str, List], url: str, tab: TabSpec, current_page: int, positions: List[int]
+) -> List[Tuple[str, ...]]:
+    """Return the rows read from a table page as tuples aligned to its _table_schema columns."""
+    page_prefix = (url, tab.name, str(current_page))
+    rows: List[Tuple[str, ...]] = []
+    for row in table_data["rows"]:
+        values = row.get("values", [])
+        value_count = len(values)
+        rows.append(
+            page_prefix
+            + (
+                row.get("playerName", ""),
+                row.get("playerUrl", ""),
+                row.get("teamName", ""),
+                row.get("teamUrl", ""),
+                row.get("playerAge", ""),
+                row.get("playerPositions", ""),
+            )
+            + tuple(values[idx] if idx < value_count else "" for idx in positions)
+        )
+    return rows
+
+
+# One round-trip per table page: read the paging counter, extract the table (or
+# return its HTML for selectolax) and click "next" when another page is wanted.
+# With `after` set it doubles as a wait_for_function predicate that stays null
+# until the counter has moved past that page and the new rows are in
+_READ_PAGE_INIT_JS = r"""
+window.__readPage = ({ container, paging, parseInPython, maxPages, after }) => {
+    const readPaging = (pagingSelector) => {
+        const node = document.querySelector(pagingSelector);
+        if (!node) {
+            return { current: 1, total: 1, hasNext: false, next: null, found: false };
+        }
+        const text = node.textContent || '';
+        const match = text.match(/Page\s+(\d+)\s*\/\s*(\d+)/i);
+        let current = 1;
+        let total = 1;
+        if (match) {
+            current = parseInt(match[1], 10);
+            total = parseInt(match[2], 10);
+        }
+        const next = node.querySelector('a#next, a.option#next');
+        const hasNext = !!next && !next.classList.contains('disabled');
+        return { current, total, hasNext, next, found: !!match };
+    };
+
+    const readTable = (containerSelector) => {
+        const container = document.querySelector(containerSelector);
+        if (!container) {
+            return { headers: [], rows: [] };
+        }
+        const table = container.querySelector('table');
+        if (!table) {
+            return { headers: [], rows: [] };
+        }
+
+        const headers = Array.from(table.querySelectorAll('thead th')).map(th => th.textContent.trim());
+        const rows = Array.from(table.querySelectorAll('tbody tr')).map(tr => {
+            const cells = Array.from(tr.querySelectorAll('td'));
+            const values = cells.map(td => td.textContent.replace(/\s+/g, ' ').trim());
+
+            const playerCell = cells[0];
+            let playerName = '';
+            let playerUrl = '';
+            let teamName = '';
+            let teamUrl = '';
+            let playerAge = '';
+            let playerPositions = '';
+            if (playerCell) {
+                const playerLink = playerCell.querySelector('a.player-link');
+                if (playerLink) {
+                    playerName = playerLink.textContent.replace(/\s+/g, ' ').trim();
+                    const href = playerLink.getAttribute('href');
+                    if (href) {
+                        playerUrl = new URL(href, window.location.href).href;
+                    }
+                }
+
+                const teamLink = playerCell.querySelector('a.player-meta-data, a.team-link');
+                if (teamLink) {
+                    teamName = teamLink.textContent.replace(/\s+/g, ' ').trim();
+                    teamName = teamName.replace(/,$/, '');
+                    const href = teamLink.getAttribute('href');
+                    if (href) {
+                        teamUrl = new URL(href, window.location.href).href;
+                    }
+                }
+
+                const metaSpans = Array.from(playerCell.querySelectorAll('span.player-meta-data'));
+                const metaText = metaSpans.map(span => span.textContent.replace(/\s+/g, ' ').trim());
+                const ageMatch = metaText.join(' ').match(/\b(\d{2})\b/);
+                playerAge = ageMatch ? ageMatch[1] : '';
+                if (metaText.length > 0) {
+                    const last = metaText[metaText.length - 1];
+                    playerPositions = last.replace(/^,?\s*/, '');
+                }
+            }
+
+            return {
+                values,
+                playerName,
+                playerUrl,
+                teamName,
+                teamUrl,
+                playerAge,
+                playerPositions,
+            };
+        });
+
+        return { headers, rows };
+    };
+
+    const { current, total, hasNext, next, found } = readPaging(paging);
+    if (after && found && current === after) {
+        return null;
+    }
+    if (after && document.querySelectorAll(`${container} tbody tr`).length === 0) {
+        return null;
+    }
+    const pageInfo = { current, total, hasNext, clicked: false };
+    let result;
+    if (parseInPython) {
+        const node = document.querySelector(container);
+        result = { pageInfo, html: node ? node.innerHTML : '' };
+    } else {
+        result = { pageInfo, tableData: readTable(container) };
+    }
+    // The table has been captured above, so the next page can start loading now
+    if (hasNext && (!maxPages || current < maxPages)) {
+        next.click();
+        pageInfo.clicked = true;
+    }
+    return result;
+};
+"""
+# Installed per context with add_init_script, so each page loop only sends its arguments
+_READ_PAGE_CALL = "args => window.__readPage(args)"
+
+
+def _parse_table(html: str, base_url: str) -> Dict[str, List]:
+    """Extract headers and player rows from a stats container, mirroring readTable in _READ_PAGE_INIT_JS."""
+    table = HTMLParser(html).css_first("table")
+    if table is None:
+        return {"headers": [], "rows": []}
+
+    headers = [th.text().strip() for th in table.css("thead th")]
+    rows = []
+    for tr in table.css("tbody tr"):
+        cells = tr.css("td")
+        player_name = player_url = team_name = team_url = player_age = player_positions = ""
+        if cells:
+            player_cell = cells[0]
+            player_link = player_cell.css_first("a.player-link")
+            if player_link is not None:
+                player_name = _clean_text(player_link.text())
+                href = player_link.attributes.get("href")
+                if href:
+                    player_url = urljoin(base_url, href)
+
+            team_link = player_cell.css_first("a.player-meta-data, a.team-link")
+            if team_link is not None:
+                team_name = _clean_text(team_link.text()).removesuffix(",")
+                href = team_link.attributes.get("href")
+                if href:
+                    team_url = urljoin(base_url, href)
+
+            meta_text = [_clean_text(span.text()) for span in player_cell.css("span.player-meta-data")]
+            age_match = _AGE_RE.search(" ".join(meta_text))
+            player_age = age_match.group(1) if age_match else ""
+            if meta_text:
+                player_positions = _LEADING_COMMA_RE.sub("", meta_text[-1])
+
+        rows.append(
+            {
+                "values": [_clean_text(td.text()) for td in cells],
+                "playerName": player_name,
+                "playerUrl": player_url,
+                "teamName": team_name,
+                "teamUrl": team_url,
+                "playerAge": player_age,
+                "playerPositions": player_positions,
+            }
+        )
+    return {"headers": headers, "rows": rows}
+
+
 class WhoScoredScraper:
     def __init__(
         self,
@@ -108,20 +483,52 @@ class WhoScoredScraper:
         tabs: Optional[List[str]] = None,
         storage_state_path: Optional[str] = None,
         save_storage_state_path: Optional[str] = None,
+        max_concurrency: int = 5,
+        cdp_endpoint: Optional[str] = None,
+        resume: bool = False,
     ) -> None:
         self.urls = urls
         self.output_file = output_file
         self.headless = headless
         self.max_pages = max_pages
         self.tabs = tabs or [tab.name for tab in TABS]
+        # Cookies (including Cloudflare clearance) are kept between runs unless paths are given
+        self.save_storage_state_path = save_storage_state_path or DEFAULT_STORAGE_STATE_PATH
+        if storage_state_path is None and os.path.exists(self.save_storage_state_path):
+            storage_state_path = self.save_storage_state_path
         self.storage_state_path = storage_state_path
-        self.save_storage_state_path = save_storage_state_path
         self._storage_saved = False
-        self.rows: List[Dict[str, str]] = []
+        self.max_concurrency = max(1, max_concurrency)
+        self.cdp_endpoint = cdp_endpoint
+        self._browser = None
+        self._context_options: Dict = {}
+        self._header_cache: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], List[int]]] = {}
+        # Finished (url, tab) CSVs live next to the output until merged; with
+        # resume=True, parts left by an earlier run with the same options are reused
+        self.resume = resume
+        self._parts_dir = f"{output_file}.parts"
+        self._scraped_urls: List[str] = []
+        self._failed_urls: set = set()
+        # Header of each part written in this run, so the merge need not reread it
+        self._part_columns: Dict[str, Tuple[str, ...]] = {}
 
     async def run(self) -> None:
         async with async_playwright() as p:
-            browser = await p.chromium.launch(
+            await self.start_browser(p)
+            try:
+                await self.scrape()
+            finally:
+                await self.stop_browser()
+
+        self.write_csv()
+
+    async def start_browser(self, p) -> None:
+        """Launch Chromium, or attach to an already running one when cdp_endpoint is set."""
+        if self.cdp_endpoint:
+            print(f"Connecting to browser at {self.cdp_endpoint}")
+            self._browser = await p.chromium.connect_over_cdp(self.cdp_endpoint)
+        else:
+            self._browser = await p.chromium.launch(
                 headless=self.headless,
                 args=[
                     "--disable-blink-features=AutomationControlled",
@@ -139,74 +546,147 @@ class WhoScoredScraper:
                 ],
             )
 
-            user_agents = [
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-            ]
-
-            context_options = {
-                "user_agent": random.choice(user_agents),
-                "viewport": {"width": 1920, "height": 1080},
-                "locale": "en-US",
-                "timezone_id": "America/New_York",
-                "permissions": ["geolocation"],
-                "geolocation": {"latitude": 40.7128, "longitude": -74.0060},
-                "extra_http_headers": {
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Connection": "keep-alive",
-                    "Upgrade-Insecure-Requests": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "sec-ch-ua": '"Chromium";v="131", "Not_A Brand";v="24"',
-                    "sec-ch-ua-mobile": "?0",
-                    "sec-ch-ua-platform": '"Windows"',
-                },
-            }
-            if self.storage_state_path:
-                context_options["storage_state"] = self.storage_state_path
+        user_agents = [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+        ]
 
-            context = await browser.new_context(**context_options)
+        self._context_options = {
+            "user_agent": random.choice(user_agents),
+            "viewport": {"width": 1920, "height": 1080},
+            "locale": "en-US",
+            "timezone_id": "America/New_York",
+            "permissions": ["geolocation"],
+            "geolocation": {"latitude": 40.7128, "longitude": -74.0060},
+            "extra_http_headers": {
+                "Accept-Language": "en-US,en;q=0.9",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+                "Accept-Encoding": "gzip, deflate, br",
+                "Connection": "keep-alive",
+                "Upgrade-Insecure-Requests": "1",
+                "Sec-Fetch-Dest": "document",
+                "Sec-Fetch-Mode": "navigate",
+                "Sec-Fetch-Site": "none",
+                "Sec-Fetch-User": "?1",
+                "sec-ch-ua": '"Chromium";v="131", "Not_A Brand";v="24"',
+                "sec-ch-ua-mobile": "?0",
+                "sec-ch-ua-platform": '"Windows"',
+            },
+        }
+        if self.storage_state_path:
+            self._context_options["storage_state"] = self.storage_state_path
+
+    async def stop_browser(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+    async def scrape(self, urls: Optional[List[str]] = None) -> None:
+        """Scrape a batch of URLs on the started browser, streaming each tab to a part file."""
+        urls = self.urls if urls is None else urls
+        if not self._scraped_urls and not self.resume:
+            # First batch of a fresh run: parts from an earlier run may not match this one
+            shutil.rmtree(self._parts_dir, ignore_errors=True)
+        self._scraped_urls.extend(url for url in urls if url not in self._scraped_urls)
+        # At most max_concurrency contexts, each reused for a few URLs and then replaced
+        pool = ContextPool(self._browser, self._context_options, self.max_concurrency)
+
+        async def scrape_url(url: str) -> None:
+            # Failures are recorded per URL so one bad URL never cancels the others
+            try:
+                await self._scrape_one(pool, url)
+            except Exception as exc:
+                print(f"Failed: {url}: {exc}")
+                self._failed_urls.add(url)
+            else:
+                self._failed_urls.discard(url)
+
+        try:
+            await _run_concurrently([scrape_url(url) for url in urls])
+        finally:
+            await pool.close()
+
+    async def _scrape_one(self, pool: ContextPool, url: str) -> int:
+        context = await pool.acquire()
+        healthy = False
+        try:
+            # Retries happen inside, per page load and per tab, so a URL is not retried as a whole
+            row_count = await self._scrape_url(context, url)
+            healthy = True
+            return row_count
+        finally:
+            # A context that failed mid-scrape is replaced rather than handed to the next URL
+            await pool.recycle(context, healthy=healthy)
+
+    async def _scrape_url(self, context, url: str) -> int:
+        print(f"Scraping: {url}")
+        # Tabs with a finished part file (from a failed attempt, or a resumed run) are not scraped again
+        tabs = [tab for tab in self._selected_tabs() if not os.path.exists(self._part_path(url, tab))]
+        if not tabs:
+            print("  All selected tabs already scraped.")
+            return 0
+
+        # One page per tab in the shared context, so tab clicks and paging overlap
+        pages = [await context.new_page() for _ in tabs]
+        try:
+            # The first page clears any challenge/consent; the others reuse its cookies
+            first_feed = await with_retry(lambda: self._open_stats_page(pages[0], url))
+
+            async def scrape(page, tab: TabSpec, opened: bool) -> int:
+                needs_open = not opened
+                nav_feed = first_feed if opened else None
+
+                async def attempt() -> int:
+                    nonlocal needs_open, nav_feed
+                    if needs_open:
+                        nav_feed = await self._open_stats_page(page, url)
+                    # A retried tab starts again from a fresh navigation
+                    needs_open = True
+                    return await self._scrape_tab(page, url, tab, nav_feed)
 
-            page = await context.new_page()
-            stealth = Stealth()
-            await stealth.apply_stealth_async(page)
+                return await with_retry(attempt)
 
-            await page.route(
-                "**/*",
-                lambda route: route.abort()
-                if route.request.resource_type in ["image", "stylesheet", "font", "media"]
-                else route.continue_(),
+            results = await _run_concurrently(
+                [scrape(page, tab, index == 0) for index, (page, tab) in enumerate(zip(pages, tabs))]
             )
+        finally:
+            await asyncio.gather(*(page.close() for page in pages), return_exceptions=True)
 
-            for url in self.urls:
-                await self._scrape_url(page, url)
+        return sum(results)
 
-            await browser.close()
+    async def _open_stats_page(self, page, url: str):
+        """Navigate to the stats page; returns the stats feed response loaded with it, if any."""
+        # Listen before navigating, so the feed behind the tab shown on load is not missed
+        feeds: List = []
 
-        self._write_csv()
+        def on_response(response) -> None:
+            if not feeds and _STATS_FEED_RE.search(response.url):
+                feeds.append(response)
 
-    async def _scrape_url(self, page, url: str) -> None:
-        print(f"Scraping: {url}")
-        await page.goto(url, wait_until="networkidle", timeout=45000)
-        await page.wait_for_timeout(random.randint(1500, 3000))
+        page.on("response", on_response)
+        try:
+            await self._load_stats_page(page, url)
+        finally:
+            page.remove_listener("response", on_response)
+        return feeds[0] if feeds else None
+
+    async def _load_stats_page(self, page, url: str) -> None:
+        # Wait for the stats table itself rather than network idle, which analytics traffic can delay
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
-        content = await page.content()
-        if _is_cloudflare_challenge(content):
+        if await _is_challenge_response(page, response):
             await _maybe_wait_for_manual_solve(
                 page,
                 save_storage_state_path=self.save_storage_state_path,
+                headless=self.headless,
             )
             await page.wait_for_timeout(3000)
 
         await _handle_consent(page)
 
         try:
-            await page.wait_for_selector("#stage-top-player-stats", timeout=45000)
+            await page.wait_for_selector("#stage-top-player-stats table tbody tr", timeout=20000)
         except PlaywrightTimeoutError:
             await _handle_consent(page)
             try:
@@ -219,13 +699,12 @@ class WhoScoredScraper:
                     "Try --headed to see if a consent or challenge page is blocking content."
                 ) from exc
 
-            if self.save_storage_state_path and not self._storage_saved:
-                await page.context.storage_state(path=self.save_storage_state_path)
-                self._storage_saved = True
-                print(f"Saved browser storage state to {self.save_storage_state_path}.")
-
-        for tab in self._selected_tabs():
-            await self._scrape_tab(page, url, tab)
+        # Save once per run after the first page gets through, so later runs start with its cookies
+        if not self._storage_saved:
+            self._storage_saved = True
+            os.makedirs(os.path.dirname(os.path.abspath(self.save_storage_state_path)), exist_ok=True)
+            await page.context.storage_state(path=self.save_storage_state_path)
+            print(f"Saved browser storage state to {self.save_storage_state_path}.")
 
     def _selected_tabs(self) -> List[TabSpec]:
         selected: List[TabSpec] = []
@@ -235,224 +714,423 @@ class WhoScoredScraper:
                 selected.append(tab)
         return selected
 
-    async def _scrape_tab(self, page, url: str, tab: TabSpec) -> None:
+    def _part_path(self, url: str, tab: TabSpec) -> str:
+        # max_pages changes a tab's rows, so it is part of the key along with the URL
+        key = f"{url}\n{self.max_pages or 0}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._parts_dir, f"{digest}_{tab.name}.csv")
+
+    async def _scrape_tab(self, page, url: str, tab: TabSpec, nav_feed=None) -> int:
         print(f"  Tab: {tab.name}")
         if await page.locator(tab.tab_link_selector).count() == 0:
             print(f"  Tab not found: {tab.name}")
-            return
-
-        await page.locator(tab.tab_link_selector).click()
-        await page.wait_for_timeout(random.randint(800, 1500))
-        await page.wait_for_selector(f"{tab.container_selector} table", timeout=30000)
+            return 0
+
+        if tab.active_on_load:
+            # Already on screen; its feed, if any, was captured during navigation
+            await _wait_for_rows(page, tab)
+            response = nav_feed
+        elif tab.name not in _FEED_FIELDS:
+            # Without a field mapping the feed cannot be used, so do not wait for it
+            await page.locator(tab.tab_link_selector).click()
+            await _wait_for_rows(page, tab)
+            response = None
+        else:
+            # The tab's table is filled from a JSON feed request; capture it so the
+            # remaining pages can be fetched directly instead of clicked through
+            feed: asyncio.Future = asyncio.get_running_loop().create_future()
+
+            def on_response(response) -> None:
+                if not feed.done() and _STATS_FEED_RE.search(response.url):
+                    feed.set_result(response)
+
+            page.on("response", on_response)
+            try:
+                await page.locator(tab.tab_link_selector).click()
+                await _wait_for_rows(page, tab)
+                try:
+                    response = await asyncio.wait_for(feed, timeout=FEED_WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    response = None
+            finally:
+                page.remove_listener("response", on_response)
+
+        part = _PartWriter(self._part_path(url, tab))
+        try:
+            if response is not None and await self._scrape_tab_feed(page, url, tab, response, part):
+                return self._commit_part(part)
+            await self._scrape_tab_dom(page, url, tab, part)
+            return self._commit_part(part)
+        except BaseException:
+            part.discard()
+            raise
+
+    def _commit_part(self, part: _PartWriter) -> int:
+        row_count = part.commit()
+        if row_count:
+            self._part_columns[part.path] = part.columns
+        return row_count
+
+    async def _scrape_tab_feed(self, page, url: str, tab: TabSpec, response, part: _PartWriter) -> bool:
+        """Page through the captured stats feed; False means use the DOM path instead."""
+        parts = urlsplit(response.url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        headers = response.request.headers
+        try:
+            # Feed rows take the columns of the table on screen, so both paths write one schema;
+            # maxPages=1 reads the table's current page without clicking "next"
+            result = await page.evaluate(
+                _READ_PAGE_CALL,
+                {
+                    "container": tab.container_selector,
+                    "paging": tab.paging_selector,
+                    "parseInPython": HTMLParser is not None,
+                    "maxPages": 1,
+                    "after": 0,
+                },
+            )
+            table_data = await _table_data(page, result)
+            table_page = result["pageInfo"].get("current", 1)
+            columns, positions = self._table_schema(tuple(table_data["headers"]))
+            field_map = _FEED_FIELDS.get(tab.name, {})
+            unmapped = [column for column in columns[len(BASE_COLUMNS):] if column not in field_map]
+            if unmapped or len(columns) == len(BASE_COLUMNS):
+                return _feed_unusable(part, f"no feed field for {', '.join(unmapped) or 'the table'}")
+            fields = [field_map[column] for column in columns[len(BASE_COLUMNS):]]
+
+            verified = False
+            payload = await response.json()
+            while True:
+                records = payload.get("playerTableStats") if isinstance(payload, dict) else None
+                if records is None:
+                    return _feed_unusable(part, "unexpected payload")
+                paging = payload.get("paging") or {}
+                current_page = int(paging.get("currentPage") or query.get("page") or 1)
+                total_pages = int(paging.get("totalPages") or current_page)
+                rows = _feed_rows(records, url, tab, current_page, fields)
+                # The mapping is only trusted once the page it shares with the table matches it exactly
+                if not verified:
+                    if current_page != table_page or rows != _table_rows(
+                        table_data, url, tab, table_page, positions
+                    ):
+                        return _feed_unusable(part, "rows differ from the table")
+                    verified = True
+                part.write(columns, rows)
+
+                if self.max_pages and current_page >= self.max_pages:
+                    print("    Reached max pages limit.")
+                    break
+                if not records or current_page >= total_pages:
+                    break
+
+                query["page"] = str(current_page + 1)
+                next_response = await page.request.get(
+                    urlunsplit(parts._replace(query=urlencode(query))),
+                    headers=headers,
+                )
+                if not next_response.ok:
+                    return _feed_unusable(part, f"HTTP {next_response.status}")
+                payload = await next_response.json()
+        except (PlaywrightError, ValueError, TypeError) as exc:
+            return _feed_unusable(part, str(exc))
+
+        print(f"    Completed {current_page}/{total_pages} pages from the stats feed.")
+        return True
+
+    def _table_schema(self, raw_headers: Tuple[str, ...]) -> Tuple[Tuple[str, ...], List[int]]:
+        """CSV columns for a table header row, and the cell index behind each stat column."""
+        # Every page of a tab shares the same header row, so build its column order once per schema
+        schema = self._header_cache.get(raw_headers)
+        if schema is None:
+            headers = _dedupe_headers([_normalize_header(h) for h in raw_headers])
+            positions = [idx for idx, header in enumerate(headers) if header != "player"]
+            schema = self._header_cache[raw_headers] = (
+                BASE_COLUMNS + tuple(headers[idx] for idx in positions),
+                positions,
+            )
+        return schema
 
+    async def _scrape_tab_dom(self, page, url: str, tab: TabSpec, part: _PartWriter) -> None:
         current_page = 1
         total_pages = None
+        read_args = {
+            "container": tab.container_selector,
+            "paging": tab.paging_selector,
+            "parseInPython": HTMLParser is not None,
+            "maxPages": self.max_pages or 0,
+            "after": 0,
+        }
+        result = await page.evaluate(_READ_PAGE_CALL, read_args)
         while True:
-            page_info = await page.evaluate(
-                r"""
-                (pagingSelector) => {
-                    const paging = document.querySelector(pagingSelector);
-                    if (!paging) {
-                        return { current: 1, total: 1, hasNext: false };
-                    }
-                    const text = paging.textContent || '';
-                    const match = text.match(/Page\s+(\d+)\s*\/\s*(\d+)/i);
-                    let current = 1;
-                    let total = 1;
-                    if (match) {
-                        current = parseInt(match[1], 10);
-                        total = parseInt(match[2], 10);
-                    }
-                    const next = paging.querySelector('a#next, a.option#next');
-                    const hasNext = next && !next.classList.contains('disabled');
-                    return { current, total, hasNext };
-                }
-                """,
-                tab.paging_selector,
-            )
-
+            page_info = result["pageInfo"]
             current_page = page_info.get("current", current_page)
             total_pages = page_info.get("total", total_pages or current_page)
 
-            table_data = await page.evaluate(
-                r"""
-                (containerSelector) => {
-                    const container = document.querySelector(containerSelector);
-                    if (!container) {
-                        return { headers: [], rows: [] };
-                    }
-                    const table = container.querySelector('table');
-                    if (!table) {
-                        return { headers: [], rows: [] };
-                    }
-
-                    const headers = Array.from(table.querySelectorAll('thead th')).map(th => th.textContent.trim());
-                    const rows = Array.from(table.querySelectorAll('tbody tr')).map(tr => {
-                        const cells = Array.from(tr.querySelectorAll('td'));
-                        const values = cells.map(td => td.textContent.replace(/\s+/g, ' ').trim());
-
-                        const playerCell = cells[0];
-                        let playerName = '';
-                        let playerUrl = '';
-                        let teamName = '';
-                        let teamUrl = '';
-                        let playerAge = '';
-                        let playerPositions = '';
-                        if (playerCell) {
-                            const playerLink = playerCell.querySelector('a.player-link');
-                            if (playerLink) {
-                                playerName = playerLink.textContent.replace(/\s+/g, ' ').trim();
-                                const href = playerLink.getAttribute('href');
-                                if (href) {
-                                    playerUrl = new URL(href, window.location.href).href;
-                                }
-                            }
-
-                            const teamLink = playerCell.querySelector('a.player-meta-data, a.team-link');
-                            if (teamLink) {
-                                teamName = teamLink.textContent.replace(/\s+/g, ' ').trim();
-                                teamName = teamName.replace(/,$/, '');
-                                const href = teamLink.getAttribute('href');
-                                if (href) {
-                                    teamUrl = new URL(href, window.location.href).href;
-                                }
-                            }
-
-                            const metaSpans = Array.from(playerCell.querySelectorAll('span.player-meta-data'));
-                            const metaText = metaSpans.map(span => span.textContent.replace(/\s+/g, ' ').trim());
-                            const ageMatch = metaText.join(' ').match(/\b(\d{2})\b/);
-                            playerAge = ageMatch ? ageMatch[1] : '';
-                            if (metaText.length > 0) {
-                                const last = metaText[metaText.length - 1];
-                                playerPositions = last.replace(/^,?\s*/, '');
-                            }
-                        }
-
-                        return {
-                            values,
-                            playerName,
-                            playerUrl,
-                            teamName,
-                            teamUrl,
-                            playerAge,
-                            playerPositions,
-                        };
-                    });
-
-                    return { headers, rows };
-                }
-                """,
-                tab.container_selector,
-            )
+            table_data = await _table_data(page, result)
 
             if not table_data.get("rows"):
                 print("    No rows found, stopping tab.")
                 break
 
-            headers = _dedupe_headers([_normalize_header(h) for h in table_data["headers"]])
-            for row in table_data["rows"]:
-                row_data: Dict[str, str] = {
-                    "source_url": url,
-                    "tab": tab.name,
-                    "page": str(current_page),
-                    "player_name": row.get("playerName", ""),
-                    "player_url": row.get("playerUrl", ""),
-                    "team_name": row.get("teamName", ""),
-                    "team_url": row.get("teamUrl", ""),
-                    "player_age": row.get("playerAge", ""),
-                    "player_positions": row.get("playerPositions", ""),
-                }
-
-                values = row.get("values", [])
-                for idx, header in enumerate(headers):
-                    if header == "player":
-                        continue
-                    if idx < len(values):
-                        row_data[header] = values[idx]
-                self.rows.append(row_data)
+            columns, positions = self._table_schema(tuple(table_data["headers"]))
+            part.write(columns, _table_rows(table_data, url, tab, current_page, positions))
 
             if self.max_pages and current_page >= self.max_pages:
                 print("    Reached max pages limit.")
                 break
 
-            if not page_info.get("hasNext", False):
+            if not page_info.get("clicked", False):
                 break
 
-            await self._click_next(page, tab.paging_selector, current_page)
-            await page.wait_for_timeout(random.randint(800, 1500))
+            # The same script polls until the next page is in and returns it in one go
+            read_args["after"] = current_page
+            handle = await page.wait_for_function(_READ_PAGE_CALL, arg=read_args, polling=100, timeout=30000)
+            result = await handle.json_value()
 
         if total_pages:
             print(f"    Completed {current_page}/{total_pages} pages.")
 
-    async def _click_next(self, page, paging_selector: str, current_page: int) -> None:
-        await page.evaluate(
-            r"""
-            (pagingSelector) => {
-                const paging = document.querySelector(pagingSelector);
-                if (!paging) return false;
-                const next = paging.querySelector('a#next, a.option#next');
-                if (!next || next.classList.contains('disabled')) return false;
-                next.click();
-                return true;
-            }
-            """,
-            paging_selector,
-        )
-        await page.wait_for_function(
-            r"""
-            ({ selector, current }) => {
-                const paging = document.querySelector(selector);
-                if (!paging) return true;
-                const text = paging.textContent || '';
-                const match = text.match(/Page\s+(\d+)\s*\/\s*(\d+)/i);
-                if (!match) return true;
-                const nextPage = parseInt(match[1], 10);
-                return nextPage !== current;
-            }
-            """,
-            {"selector": paging_selector, "current": current_page},
-            timeout=30000,
-        )
-
-    def _write_csv(self) -> None:
-        if not self.rows:
+    def write_csv(self) -> None:
+        """Merge the finished part files of every scrape() call into the output CSV, in URL and tab order."""
+        part_paths = [
+            path
+            for url in self._scraped_urls
+            for tab in self._selected_tabs()
+            if os.path.exists(path := self._part_path(url, tab))
+        ]
+        if not part_paths:
             print("No rows collected; CSV not written.")
             return
 
-        base_columns = [
-            "source_url",
-            "tab",
-            "page",
-            "player_name",
-            "player_url",
-            "team_name",
-            "team_url",
-            "player_age",
-            "player_positions",
-        ]
-        all_keys = set(base_columns)
-        for row in self.rows:
-            all_keys.update(row.keys())
+        # Columns are appended in first-seen order while visiting parts in output order;
+        # only parts left over from an earlier run need their header read from disk
+        columns = list(BASE_COLUMNS)
+        column_set = set(columns)
+        part_headers: List[Tuple[str, ...]] = []
+        for path in part_paths:
+            header = self._part_columns.get(path)
+            if header is None:
+                with open(path, newline="", encoding="utf-8") as file:
+                    header = tuple(next(csv.reader(file), []))
+            part_headers.append(header)
+            for column in header:
+                if column not in column_set:
+                    column_set.add(column)
+                    columns.append(column)
+
+        col_index = {column: index for index, column in enumerate(columns)}
+
+        row_count = 0
+        with open(self.output_file, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for path, header in zip(part_paths, part_headers):
+                # Map each part column to its output position once, then place values by index
+                positions = [col_index[column] for column in header]
+                with open(path, newline="", encoding="utf-8") as part_file:
+                    reader = csv.reader(part_file)
+                    next(reader, None)
+                    for values in reader:
+                        out = [""] * len(columns)
+                        for position, value in zip(positions, values):
+                            out[position] = value
+                        writer.writerow(out)
+                        row_count += 1
+
+        print(f"Saved {row_count} rows to {self.output_file}.")
+        if self._failed_urls:
+            print(f"Keeping finished tabs in {self._parts_dir}; rerun with --resume to only scrape what failed.")
+        else:
+            shutil.rmtree(self._parts_dir, ignore_errors=True)
+
+
+class ContextPool:
+    """Bounded set of browser contexts shared by URL tasks, each replaced after max_uses URLs."""
+
+    def __init__(self, browser, context_options: Dict, size: int, max_uses: int = CONTEXT_MAX_USES) -> None:
+        self._browser = browser
+        self._context_options = context_options
+        self._size = size
+        self.max_uses = max_uses
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._uses: Dict[object, int] = {}
+        self._created = 0
+
+    async def acquire(self):
+        # None in the idle queue is a free slot whose context still has to be created
+        if self._idle.empty() and self._created < self._size:
+            self._created += 1
+            context = None
+        else:
+            context = await self._idle.get()
+        if context is not None:
+            return context
+        try:
+            return await self._new_context()
+        except BaseException:
+            self._idle.put_nowait(None)
+            raise
+
+    async def recycle(self, context, healthy: bool = True) -> None:
+        uses = self._uses.pop(context) + 1
+        if healthy and uses < self.max_uses:
+            self._uses[context] = uses
+            self._idle.put_nowait(context)
+            return
 
-        extra_columns = sorted([key for key in all_keys if key not in base_columns])
-        columns = base_columns + extra_columns
+        # Closing the context releases its DOM, JS heap and caches; the next
+        # acquire() creates its replacement
+        try:
+            await context.close()
+        finally:
+            self._idle.put_nowait(None)
+
+    async def close(self) -> None:
+        contexts = list(self._uses)
+        self._uses.clear()
+        await asyncio.gather(*(context.close() for context in contexts), return_exceptions=True)
+
+    async def _new_context(self):
+        context = await self._browser.new_context(**self._context_options)
+        # Stealth is injected once per context and inherited by every tab page
+        await context.add_init_script(_STEALTH_SCRIPT)
+        # The table reader is compiled once per document instead of sent with every call
+        await context.add_init_script(_READ_PAGE_INIT_JS)
+        # Context-level routes cover every tab page; the asset pattern is
+        # registered last so it is matched before the catch-all router
+        await context.route("**/*", _route_request)
+        await context.route(_BLOCKED_ASSET_GLOB, _abort_route)
+        self._uses[context] = 0
+        return context
+
+
+class _PartWriter:
+    """CSV for one (url, tab), written page by page and moved into place once the tab completes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = None
+        self._writer = None
+        self.columns: Tuple[str, ...] = ()
+
+    def write(self, columns: Tuple[str, ...], rows: List[Tuple[str, ...]]) -> None:
+        """Write rows aligned to columns; the first batch fixes the part's header."""
+        if not rows:
+            return
+        if self._writer is None:
+            self.columns = columns
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self._tmp_path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(columns)
+        elif columns != self.columns:
+            # Re-align to the header already written; columns it lacks are dropped
+            index = {column: idx for idx, column in enumerate(columns)}
+            positions = [index.get(column) for column in self.columns]
+            rows = [tuple("" if idx is None else row[idx] for idx in positions) for row in rows]
+        self._writer.writerows(rows)
+        self.count += len(rows)
+
+    def commit(self) -> int:
+        if self._file is not None:
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+        return self.count
+
+    def discard(self) -> None:
+        """Drop the rows written so far; the writer can be reused from a fresh header."""
+        if self._file is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+        self._file = None
+        self._writer = None
+        self.columns = ()
+        self.count = 0
+
+
+def _feed_unusable(part: _PartWriter, reason: str) -> bool:
+    # Rows already streamed from the feed are dropped, so the table re-scrape starts clean;
+    # feed pages are fetched with page.request, so the table is still on its first page
+    if part.count:
+        print(f"    Stats feed failed after {part.count} rows ({reason}), re-reading the tab from the table.")
+        part.discard()
+    else:
+        print(f"    Stats feed unusable ({reason}), falling back to the table.")
+    return False
 
-        with open(self.output_file, "w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=columns)
-            writer.writeheader()
-            writer.writerows(self.rows)
 
-        print(f"Saved {len(self.rows)} rows to {self.output_file}.")
+async def with_retry(
+    coro_factory: Callable[[], Awaitable[T]],
+    attempts: int = RETRY_ATTEMPTS,
+    base: float = RETRY_BASE_DELAY,
+) -> T:
+    """Await coro_factory(), retrying Playwright errors with exponential backoff and jitter."""
+    for attempt in range(attempts):
+        try:
+            return await coro_factory()
+        except PlaywrightError as exc:
+            if attempt == attempts - 1:
+                raise
+            delay = base * 2**attempt + random.random()
+            print(f"    {type(exc).__name__}, retrying in {delay:.1f}s (attempt {attempt + 2}/{attempts}).")
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def _run_concurrently(coros: List[Awaitable[T]]) -> List[T]:
+    """Run coroutines concurrently; when one fails the rest are cancelled and its exception is raised."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        # Surface the failure itself (not a group) so callers and with_retry see its real type
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _abort_route(route) -> None:
+    await route.abort()
+
+
+async def _route_request(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCK_RESOURCE_TYPES or any(host in request.url for host in BLOCK_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 def _is_cloudflare_challenge(content: str) -> bool:
-    markers = [
-        "Checking your browser",
-        "Just a moment",
-        "cf-browser-verification",
-        "challenge-platform",
-    ]
-    return any(marker in content for marker in markers)
+    return _CF_RE.search(content) is not None
+
+
+async def _is_challenge_response(page, response) -> bool:
+    """Judge the navigation by its status and headers; only scan the HTML when they are ambiguous."""
+    if response is not None:
+        if response.headers.get("cf-mitigated") == "challenge":
+            return True
+        if response.status not in _CF_STATUSES:
+            return False
+    return _is_cloudflare_challenge(await page.content())
+
+
+async def _table_data(page, result: Dict) -> Dict[str, List]:
+    if "html" in result:
+        # Parse the container HTML in a worker thread instead of serializing rows over CDP
+        return await asyncio.to_thread(_parse_table, result["html"], page.url)
+    return result["tableData"]
+
+
+async def _wait_for_rows(page, tab: TabSpec) -> None:
+    await page.wait_for_function(
+        "sel => document.querySelectorAll(sel).length > 0",
+        arg=f"{tab.container_selector} tbody tr",
+        timeout=30000,
+    )
 
 
 async def _handle_consent(page) -> None:
@@ -478,9 +1156,12 @@ async def _handle_consent(page) -> None:
                 continue
 
 
-async def _maybe_wait_for_manual_solve(page, save_storage_state_path: Optional[str]) -> None:
-    if not save_storage_state_path:
-        print("Cloudflare challenge detected. Provide --save-storage-state and --headed to solve once.")
+async def _maybe_wait_for_manual_solve(page, save_storage_state_path: Optional[str], headless: bool) -> None:
+    if headless or not save_storage_state_path:
+        print(
+            "Cloudflare challenge detected. Run once with --headed to solve it; "
+            f"cookies are then saved to {save_storage_state_path}."
+        )
         return
     if page.is_closed():
         return
@@ -534,12 +1215,30 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--storage-state",
         default=None,
-        help="Path to a Playwright storage state JSON file to reuse cookies.",
+        help="Path to a Playwright storage state JSON file to reuse cookies "
+        f"(default: {DEFAULT_STORAGE_STATE_PATH} when it exists).",
     )
     parser.add_argument(
         "--save-storage-state",
         default=None,
-        help="Path to save Playwright storage state after a manual solve.",
+        help="Path to save Playwright storage state after the first successful page "
+        f"(default: {DEFAULT_STORAGE_STATE_PATH}).",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=5,
+        help="Maximum number of URLs scraped at the same time, each in its own browser context.",
+    )
+    parser.add_argument(
+        "--cdp-endpoint",
+        default=None,
+        help="Connect to an already running Chromium over CDP (e.g. http://localhost:9222) instead of launching one.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse tabs finished by an earlier run with the same --output and --max-pages instead of starting over.",
     )
     return parser.parse_args()
 
@@ -567,6 +1266,9 @@ async def main() -> None:
         tabs=tabs,
         storage_state_path=args.storage_state,
         save_storage_state_path=args.save_storage_state,
+        max_concurrency=args.max_concurrency,
+        cdp_endpoint=args.cdp_endpoint,
+        resume=args.resume,
     )
     await scraper.run()
 